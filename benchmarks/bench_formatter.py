@@ -0,0 +1,40 @@
+"""
+Микробенчмарк форматирования записи: logging.Formatter против CompiledFormatter.
+
+Запуск: python benchmarks/bench_formatter.py
+"""
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profi_log.formatters import CachedFormatter, CompiledFormatter  # noqa: E402
+
+NUMBER = 200000
+FORMATS = (
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    '%(asctime)s %(levelname)-8s [%(threadName)s] %(name)s:%(lineno)d %(message)s',
+)
+
+
+def bench(label: str, stmt, number: int = NUMBER) -> float:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    per_call = seconds / number * 1e9
+    print(f"{label:<50} {per_call:8.1f} нс/вызов")
+    return per_call
+
+
+def main() -> None:
+    record = logging.LogRecord("bench.formatter", logging.INFO, __file__, 42, "значение %s", (42,), None)
+    for fmt in FORMATS:
+        print(f"Формат: {fmt}")
+        for label, formatter in (("  logging.Formatter", logging.Formatter(fmt)),
+                                 ("  CachedFormatter", CachedFormatter(fmt)),
+                                 ("  CompiledFormatter", CompiledFormatter(fmt))):
+            bench(label, lambda: formatter.format(record))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Микробенчмарк стоимости вызова отключенного уровня логирования.
+
+Запуск: python benchmarks/bench_level_gating.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profi_log import MasterLogger  # noqa: E402
+
+NUMBER = 500000
+
+
+def bench(label: str, stmt, number: int = NUMBER) -> float:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    per_call = seconds / number * 1e9
+    print(f"{label:<50} {per_call:8.1f} нс/вызов")
+    return per_call
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        master_logger = MasterLogger(os.path.join(temp_dir, "bench.log"), name="bench", level="INFO")
+        proxy = master_logger.get_logger("bench.proxy")
+        root_logger = master_logger._root_logger
+        value = 42
+
+        print("Отключенный уровень (debug при уровне INFO):")
+        bench("  logging.Logger.debug", lambda: root_logger.debug("значение %s", value))
+        bench("  MasterLogger.debug", lambda: master_logger.debug("значение %s", value))
+        bench("  MasterLogger.debug с f-строкой", lambda: master_logger.debug(f"значение {value}"))
+        bench("  if master_logger.debug_enabled: ...",
+              lambda: master_logger.debug_enabled and master_logger.debug(f"значение {value}"))
+        bench("  LoggerProxy.debug", lambda: proxy.debug("значение %s", value))
+        bench("  if proxy.debug_enabled: ...", lambda: proxy.debug_enabled and proxy.debug(f"значение {value}"))
+
+        master_logger.close()
+        logging.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Микробенчмарк накладных расходов LoggerProxy по сравнению с обычным logging.Logger.
+
+Запуск: python benchmarks/bench_logger_proxy.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profi_log import MasterLogger  # noqa: E402
+
+NUMBER = 200000
+
+
+def bench(label: str, stmt, number: int = NUMBER) -> float:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    per_call = seconds / number * 1e9
+    print(f"{label:<45} {per_call:8.1f} нс/вызов")
+    return per_call
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        master_logger = MasterLogger(os.path.join(temp_dir, "bench.log"), name="bench", level="INFO")
+        master_logger.close()
+        master_logger._root_logger.addHandler(logging.NullHandler())
+
+        bare = logging.getLogger("bench.bare")
+        bare.setLevel(logging.INFO)
+        proxy = master_logger.get_logger("bench.proxy")
+
+        print("Отключенный уровень (debug при уровне INFO):")
+        bare_cost = bench("  logging.Logger.debug", lambda: bare.debug("сообщение"))
+        proxy_cost = bench("  LoggerProxy.debug", lambda: proxy.debug("сообщение"))
+        print(f"  накладные расходы прокси: {proxy_cost - bare_cost:+.1f} нс/вызов")
+
+        print("Включенный уровень (info в NullHandler):")
+        bare_cost = bench("  logging.Logger.info", lambda: bare.info("сообщение"))
+        proxy_cost = bench("  LoggerProxy.info", lambda: proxy.info("сообщение"))
+        print(f"  накладные расходы прокси: {proxy_cost - bare_cost:+.1f} нс/вызов")
+
+        print("Вспомогательные методы MasterLogger:")
+        bench("  LoggerProxy.log_exception (поиск атрибута)", lambda: proxy.log_exception)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Бенчмарк записи в один файл лога из нескольких процессов: file_sink='rotating' против 'multiprocess'.
+
+Для каждого числа процессов выводится пропускная способность, а также количество потерянных
+и поврежденных строк во всех файлах лога, включая резервные копии.
+
+Запуск: python benchmarks/bench_multiprocess.py
+"""
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profi_log import MasterLogger  # noqa: E402
+
+PROCESSES = (4, 16, 64)
+RECORDS = 2000
+MAX_BYTES = 1024 * 1024
+LINE = re.compile(r'^\S+ \S+ - bench - INFO - \d+:\d+ x{100}$')
+
+
+def worker(log_file: str, sink: str, worker_id: int, start: multiprocessing.Event) -> None:
+    # Ошибки ротации RotatingFileHandler при гонке процессов учитываются как потерянные строки
+    logging.raiseExceptions = False
+    master_logger = MasterLogger(log_file, name="bench", max_bytes=MAX_BYTES, backup_count=10000, file_sink=sink,
+                                 report_interval=0)
+    payload = "x" * 100
+    start.wait()
+    for i in range(RECORDS):
+        master_logger.info(f"{worker_id}:{i} {payload}")
+    master_logger.close()
+
+
+def run(sink: str, processes: int) -> None:
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file = os.path.join(temp_dir, "bench.log")
+        start = context.Event()
+        workers = [context.Process(target=worker, args=(log_file, sink, i, start)) for i in range(processes)]
+        for process in workers:
+            process.start()
+        # Даем процессам создать логгеры до начала отсчета
+        time.sleep(0.5)
+        started = time.perf_counter()
+        start.set()
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        lines = []
+        for name in os.listdir(temp_dir):
+            if not name.endswith(".lock"):
+                with open(os.path.join(temp_dir, name), "r", encoding="utf-8", errors="replace") as f:
+                    lines.extend(f.read().splitlines())
+        total = processes * RECORDS
+        corrupted = sum(1 for line in lines if not LINE.match(line))
+        lost = total - (len(lines) - corrupted)
+        print(f"  {sink:<13} {processes:>3} процессов: {total / elapsed:>10,.0f} записей/с, "
+              f"потеряно {lost:,}, повреждено {corrupted:,}")
+
+
+def main() -> None:
+    print(f"Запись {RECORDS:,} записей на процесс, ротация каждые {MAX_BYTES // 1024} КБ:")
+    for processes in PROCESSES:
+        for sink in ("rotating", "multiprocess"):
+            run(sink, processes)
+
+
+if __name__ == '__main__':
+    main()
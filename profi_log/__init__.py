@@ -1 +1,3 @@
-from .master_logger import MasterLogger
\ No newline at end of file
+from .master_logger import MasterLogger
+from .messages import LazyMessage
+from .async_logger import AsyncMasterLogger
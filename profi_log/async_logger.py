@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import queue
+import threading
+import weakref
+from typing import Any, Callable, List, Optional
+from .handlers import DispatchingHandler
+from .master_logger import MasterLogger
+
+# Через сколько секунд простоя поток очереди проверяет, не закрыт ли его цикл событий
+IDLE_TIMEOUT = 1.0
+
+_STOP = object()
+
+
+class _FlushMarker:
+    """
+    Маркер в очереди: после его обработки все предыдущие записи переданы обработчикам.
+    """
+
+    __slots__ = ('callback',)
+
+    def __init__(self, callback: Callable[[], None]):
+        self.callback = callback
+
+
+def _set_result_unless_done(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _LoopWriter:
+    """
+    Очередь и поток, обслуживающие один цикл событий.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, dispatch: Callable[[logging.LogRecord], None],
+                 flush: Callable[[], None]):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._loop_ref = weakref.ref(loop)
+        self._dispatch = dispatch
+        self._flush = flush
+        self._thread = threading.Thread(target=self._run, name=f'profi_log-loop-{id(loop):x}', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self.queue.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                loop = self._loop_ref()
+                if loop is None or loop.is_closed():
+                    return
+                continue
+            if item is _STOP:
+                return
+            if isinstance(item, _FlushMarker):
+                self._flush()
+                try:
+                    item.callback()
+                except RuntimeError:
+                    # Цикл событий уже закрыт, ожидать результата некому
+                    pass
+                continue
+            self._dispatch(item)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def flush(self) -> None:
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(_FlushMarker(done.set))
+        done.wait()
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+
+
+class LoopQueueHandler(DispatchingHandler):
+    """
+    Обработчик, который в потоке цикла событий только помещает запись в очередь этого цикла.
+
+    Каждому циклу событий соответствует своя очередь и свой поток, который передает записи
+    настоящим обработчикам (файл, консоль, email). Записи из потоков без цикла событий
+    передаются обработчикам сразу.
+    """
+
+    def __init__(self):
+        """
+        Инициализация LoopQueueHandler.
+        """
+        super().__init__()
+        self._writers: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopWriter]' = \
+            weakref.WeakKeyDictionary()
+        # Сильные ссылки нужны, чтобы дописать очередь цикла, который уже удален сборщиком мусора
+        self._active_writers: List[_LoopWriter] = []
+        self._writers_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Помещает запись в очередь текущего цикла событий или передает ее обработчикам сразу.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dispatch(record)
+            return
+        self.get_writer(loop).queue.put(record)
+
+    def get_writer(self, loop: asyncio.AbstractEventLoop, create: bool = True) -> Optional[_LoopWriter]:
+        """
+        Возвращает очередь цикла событий, при необходимости создавая ее.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Цикл событий.
+            create (bool): Создать очередь, если ее еще нет. По умолчанию True.
+
+        Returns:
+            Optional[_LoopWriter]: Очередь цикла событий или None.
+        """
+        writer = self._writers.get(loop)
+        if writer is None and create:
+            with self._writers_lock:
+                writer = self._writers.get(loop)
+                if writer is None:
+                    writer = _LoopWriter(loop, self._dispatch, self._flush_handlers)
+                    self._writers[loop] = writer
+                    self._active_writers = [w for w in self._active_writers if w.is_alive()] + [writer]
+        return writer
+
+    def flush(self) -> None:
+        """
+        Дожидается обработки записей во всех очередях и сбрасывает буферы обработчиков.
+        """
+        for writer in list(self._active_writers):
+            writer.flush()
+        self._flush_handlers()
+
+    def close(self) -> None:
+        """
+        Дописывает записи из всех очередей и останавливает их потоки.
+        """
+        with self._writers_lock:
+            writers, self._active_writers = self._active_writers, []
+            self._writers.clear()
+        for writer in writers:
+            writer.stop()
+        super().close()
+
+
+class AsyncMasterLogger(MasterLogger):
+    """
+    MasterLogger для приложений на asyncio.
+
+    Все обработчики MasterLogger подключаются через LoopQueueHandler, поэтому поток цикла событий
+    только помещает запись в очередь, а запись на диск и отправка по сети выполняются в фоновом потоке.
+    """
+
+    def __init__(self, log_file_name: str, *args: Any, **kwargs: Any):
+        """
+        Инициализация AsyncMasterLogger.
+
+        Args:
+            log_file_name (str): Имя файла для логов.
+            *args (Any): Позиционные параметры MasterLogger.
+            **kwargs (Any): Именованные параметры MasterLogger.
+        """
+        self._dispatcher = LoopQueueHandler()
+        super().__init__(log_file_name, *args, **kwargs)
+
+    def _add_handler(self, handler: logging.Handler) -> None:
+        if self._dispatcher not in self._handlers:
+            super()._add_handler(self._dispatcher)
+        self._dispatcher.handlers.append(handler)
+        self._handlers.append(handler)
+
+    async def aflush(self) -> None:
+        """
+        Дожидается, пока все записи текущего цикла событий будут переданы обработчикам,
+        не блокируя цикл событий.
+        """
+        loop = asyncio.get_running_loop()
+        writer = self._dispatcher.get_writer(loop, create=False)
+        if writer is None:
+            return
+        future = loop.create_future()
+        writer.queue.put(_FlushMarker(lambda: loop.call_soon_threadsafe(_set_result_unless_done, future)))
+        await future
+
+    async def aclose(self) -> None:
+        """
+        Закрывает логгер в фоновом потоке, не блокируя цикл событий.
+        """
+        await self.aflush()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,449 @@
+import logging
+import operator
+import os
+import re
+import struct
+from collections.abc import Mapping
+from logging.handlers import RotatingFileHandler
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+# Начало сессии записи: после него таблицы строк и база времени сбрасываются.
+# Пишется при каждом открытии файла, поэтому дописывание в существующий файл безопасно.
+SESSION_MAGIC = b'PLB\x01'
+TAG_SESSION = SESSION_MAGIC[0]
+TAG_STRING = 0x01
+TAG_RECORD = 0x02
+
+# Типы аргументов сообщения
+ARG_NONE = 0
+ARG_FALSE = 1
+ARG_TRUE = 2
+ARG_INT = 3
+ARG_FLOAT = 4
+ARG_STR = 5
+ARG_BYTES = 6
+ARG_REPR = 7
+
+# Спецификация %-форматирования: экранированный %% либо флаги, ширина, точность и тип преобразования.
+# Ширина и точность '*' берут значение из аргументов
+CONVERSION_SPEC = re.compile(r'%(?:%|[#0+ -]*(\*|\d+)?(?:\.(\*|\d*))?[hlL]?([diouxXeEfFgGcrsa]))')
+# Преобразование аргумента, не являющегося простым значением, перед сохранением
+INT_CONVERSIONS = {'d': int, 'i': int, 'u': int, 'o': operator.index, 'x': operator.index,
+                   'X': operator.index}
+FLOAT_CONVERSIONS = frozenset('eEfFgG')
+
+# Флаги записи
+FLAG_INLINE_MESSAGE = 0x01
+FLAG_EXC_TEXT = 0x02
+FLAG_STACK_INFO = 0x04
+
+DOUBLE = struct.Struct('<d')
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def _conversions(template: str) -> Optional[Tuple[str, ...]]:
+    # Тип преобразования для каждого позиционного аргумента; '*' - ширина или точность из аргументов
+    result = []
+    for match in CONVERSION_SPEC.finditer(template):
+        if match.group(3) is None:
+            continue
+        result.extend('*' for group in match.group(1, 2) if group == '*')
+        result.append(match.group(3))
+    return tuple(result)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_signed(out: bytearray, value: int) -> None:
+    # zigzag: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+    _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+
+def _write_str(out: bytearray, value: str) -> None:
+    data = value.encode('utf-8', 'surrogateescape')
+    _write_varint(out, len(data))
+    out += data
+
+
+class BinaryRecordEncoder:
+    """
+    Кодирует записи лога в компактный двоичный формат.
+
+    Время хранится как разность с предыдущей записью в микросекундах, имена логгеров, уровней и шаблоны
+    сообщений заменяются номерами из таблицы строк, аргументы сообщения сохраняются без форматирования.
+    """
+
+    def __init__(self, max_strings: int = 4096):
+        """
+        Инициализация BinaryRecordEncoder.
+
+        Args:
+            max_strings (int): Максимальный размер таблицы строк. Строки сверх лимита пишутся в каждую запись.
+                По умолчанию 4096.
+        """
+        self.max_strings = max_strings
+        self._conversions: Dict[str, Tuple[str, ...]] = {}
+        self.reset()
+
+    def reset(self) -> bytes:
+        """
+        Начинает новую сессию записи.
+
+        Returns:
+            bytes: Маркер начала сессии, который нужно записать в файл.
+        """
+        self._strings: Dict[str, int] = {}
+        self._last_time = 0
+        return SESSION_MAGIC
+
+    def _intern(self, out: bytearray, value: str) -> Optional[int]:
+        string_id = self._strings.get(value)
+        if string_id is None:
+            if len(self._strings) >= self.max_strings:
+                return None
+            string_id = len(self._strings) + 1
+            self._strings[value] = string_id
+            out.append(TAG_STRING)
+            _write_varint(out, string_id)
+            _write_str(out, value)
+        return string_id
+
+    def encode(self, record: logging.LogRecord, exc_text: Optional[str] = None) -> bytes:
+        """
+        Кодирует запись.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+            exc_text (Optional[str]): Отформатированная трассировка исключения.
+
+        Returns:
+            bytes: Определения новых строк и сама запись.
+        """
+        out = bytearray()
+        name_id = self._intern(out, record.name) or 0
+        level_id = self._intern(out, record.levelname) or 0
+
+        args = record.args
+        template_id = None
+        if isinstance(record.msg, str) and args and not isinstance(args, Mapping):
+            template_id = self._intern(out, record.msg)
+        if template_id is None:
+            # Сообщение без аргументов (в том числе f-строки) пишется готовым текстом, чтобы не раздувать таблицу
+            message = record.getMessage()
+            args = ()
+
+        flags = 0
+        if template_id is None:
+            flags |= FLAG_INLINE_MESSAGE
+        if exc_text:
+            flags |= FLAG_EXC_TEXT
+        if record.stack_info:
+            flags |= FLAG_STACK_INFO
+
+        created = int(record.created * 1_000_000)
+        out.append(TAG_RECORD)
+        _write_signed(out, created - self._last_time)
+        self._last_time = created
+        _write_varint(out, name_id)
+        if not name_id:
+            _write_str(out, record.name)
+        _write_varint(out, level_id)
+        if not level_id:
+            _write_str(out, record.levelname)
+        _write_varint(out, record.levelno)
+        out.append(flags)
+        if template_id is None:
+            _write_str(out, message)
+        else:
+            _write_varint(out, template_id)
+            _write_varint(out, len(args))
+            conversions = self._template_conversions(record.msg)
+            if len(conversions) != len(args):
+                conversions = ('s',) * len(args)
+            for arg, conversion in zip(args, conversions):
+                self._write_arg(out, arg, conversion)
+        if exc_text:
+            _write_str(out, exc_text)
+        if record.stack_info:
+            _write_str(out, record.stack_info)
+        return bytes(out)
+
+    def _template_conversions(self, template: str) -> Tuple[str, ...]:
+        conversions = self._conversions.get(template)
+        if conversions is None:
+            conversions = _conversions(template)
+            if len(self._conversions) < self.max_strings:
+                self._conversions[template] = conversions
+        return conversions
+
+    @staticmethod
+    def _write_arg(out: bytearray, arg: Any, conversion: str = 's') -> None:
+        if arg is None:
+            out.append(ARG_NONE)
+        elif arg is True:
+            out.append(ARG_TRUE)
+        elif arg is False:
+            out.append(ARG_FALSE)
+        elif type(arg) is int:
+            out.append(ARG_INT)
+            _write_signed(out, arg)
+        elif type(arg) is float:
+            out.append(ARG_FLOAT)
+            out += DOUBLE.pack(arg)
+        elif isinstance(arg, bytes):
+            out.append(ARG_BYTES)
+            _write_varint(out, len(arg))
+            out += arg
+        elif isinstance(arg, str):
+            out.append(ARG_STR)
+            _write_str(out, arg)
+        else:
+            # Прочие объекты сохраняются в том виде, в котором их выведет шаблон: repr для %r и %a,
+            # число для числовых преобразований, строка для остальных
+            try:
+                if conversion in ('r', 'a'):
+                    out.append(ARG_REPR)
+                    _write_str(out, repr(arg))
+                    return
+                if conversion in INT_CONVERSIONS:
+                    value = INT_CONVERSIONS[conversion](arg)
+                    out.append(ARG_INT)
+                    _write_signed(out, value)
+                    return
+                if conversion in FLOAT_CONVERSIONS:
+                    value = float(arg)
+                    out.append(ARG_FLOAT)
+                    out += DOUBLE.pack(value)
+                    return
+            except (TypeError, ValueError, OverflowError):
+                # Преобразование невозможно: при декодировании шаблон будет выведен вместе с аргументами
+                pass
+            out.append(ARG_STR)
+            _write_str(out, str(arg))
+
+
+class _Rendered(str):
+    """
+    Текст repr() объекта, сохраненный при записи: %r и %a выводят его без дополнительных кавычек.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class _Reader:
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def byte(self) -> int:
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            value = self.data[self.pos]
+            self.pos += 1
+            result |= (value & 0x7f) << shift
+            if value < 0x80:
+                return result
+            shift += 7
+
+    def signed(self) -> int:
+        value = self.varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def raw(self, size: int) -> bytes:
+        value = self.data[self.pos:self.pos + size]
+        if len(value) < size:
+            raise IndexError("Неполная запись")
+        self.pos += size
+        return value
+
+    def str(self) -> str:
+        return self.raw(self.varint()).decode('utf-8', 'surrogateescape')
+
+    def arg(self) -> Any:
+        kind = self.byte()
+        if kind == ARG_NONE:
+            return None
+        if kind == ARG_TRUE:
+            return True
+        if kind == ARG_FALSE:
+            return False
+        if kind == ARG_INT:
+            return self.signed()
+        if kind == ARG_FLOAT:
+            return DOUBLE.unpack(self.raw(DOUBLE.size))[0]
+        if kind == ARG_BYTES:
+            return self.raw(self.varint())
+        if kind == ARG_STR:
+            return self.str()
+        if kind == ARG_REPR:
+            return _Rendered(self.str())
+        raise ValueError(f"Неизвестный тип аргумента: {kind}")
+
+
+def decode_records(data: bytes) -> Iterator[logging.LogRecord]:
+    """
+    Декодирует записи из двоичного формата.
+
+    Неполная запись в конце (например, после аварийного завершения процесса) пропускается.
+
+    Args:
+        data (bytes): Содержимое файла.
+
+    Yields:
+        logging.LogRecord: Восстановленные записи.
+
+    Raises:
+        ValueError: Если данные не являются двоичным логом.
+    """
+    if not data.startswith(SESSION_MAGIC):
+        raise ValueError("Данные не являются двоичным логом profi_log")
+    reader = _Reader(data)
+    strings: Dict[int, str] = {}
+    last_time = 0
+    while reader.pos < len(data):
+        start = reader.pos
+        try:
+            tag = reader.byte()
+            if tag == TAG_SESSION:
+                reader.raw(len(SESSION_MAGIC) - 1)
+                strings = {}
+                last_time = 0
+            elif tag == TAG_STRING:
+                string_id = reader.varint()
+                strings[string_id] = reader.str()
+            elif tag == TAG_RECORD:
+                last_time += reader.signed()
+                name_id = reader.varint()
+                name = strings[name_id] if name_id else reader.str()
+                level_id = reader.varint()
+                levelname = strings[level_id] if level_id else reader.str()
+                levelno = reader.varint()
+                flags = reader.byte()
+                if flags & FLAG_INLINE_MESSAGE:
+                    msg: str = reader.str()
+                    args: Tuple[Any, ...] = ()
+                else:
+                    msg = strings[reader.varint()]
+                    args = tuple(reader.arg() for _ in range(reader.varint()))
+                exc_text = reader.str() if flags & FLAG_EXC_TEXT else None
+                stack_info = reader.str() if flags & FLAG_STACK_INFO else None
+
+                record = logging.LogRecord(name, levelno, '', 0, msg, args or None, None, sinfo=stack_info)
+                record.levelname = levelname
+                record.created = last_time / 1_000_000
+                record.msecs = (last_time % 1_000_000) / 1000
+                record.exc_text = exc_text
+                yield record
+            else:
+                raise ValueError(f"Неизвестный тип блока {tag} на позиции {start}")
+        except IndexError:
+            return
+
+
+class _SafeFormatter(logging.Formatter):
+    """
+    Форматтер, который при несовпадении шаблона и аргументов выводит их как есть.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        try:
+            return super().format(record)
+        except (TypeError, ValueError):
+            record.msg = f"{record.msg} {record.args}"
+            record.args = None
+            return super().format(record)
+
+
+def decode_file(filename: str, format_string: str = DEFAULT_FORMAT) -> Iterator[str]:
+    """
+    Преобразует двоичный лог в текстовые строки.
+
+    Args:
+        filename (str): Имя файла двоичного лога.
+        format_string (str): Строка форматирования записей. По умолчанию формат файлового лога MasterLogger.
+
+    Yields:
+        str: Отформатированные записи.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    formatter = _SafeFormatter(format_string)
+    for record in decode_records(data):
+        yield formatter.format(record)
+
+
+class BinaryFileHandler(RotatingFileHandler):
+    """
+    Файловый обработчик с ротацией, который пишет записи в компактном двоичном формате.
+
+    Сообщение не форматируется в процессе: шаблон и аргументы сохраняются как есть, а текст
+    восстанавливается командой ``profi_log decode``. Форматируются только трассировки исключений.
+    """
+
+    def __init__(self, filename: str, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = None, delay: bool = False, max_strings: int = 4096):
+        """
+        Инициализация BinaryFileHandler.
+
+        Args:
+            filename (str): Имя файла для логов.
+            mode (str): Режим открытия файла. Используется только для совместимости с RotatingFileHandler.
+            maxBytes (int): Максимальный размер файла логов в байтах. 0 - без ротации.
+            backupCount (int): Количество резервных копий файлов логов.
+            encoding (Optional[str]): Не используется: строки всегда кодируются в UTF-8.
+            delay (bool): Открывать файл только при первой записи.
+            max_strings (int): Максимальный размер таблицы строк одного файла. По умолчанию 4096.
+        """
+        self.encoder = BinaryRecordEncoder(max_strings)
+        self._file_size = 0
+        super().__init__(filename, mode, maxBytes, backupCount, None, delay)
+
+    def _open(self) -> BinaryIO:
+        stream = open(self.baseFilename, 'ab')
+        self._file_size = stream.seek(0, os.SEEK_END)
+        session = self.encoder.reset()
+        stream.write(session)
+        self._file_size += len(session)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Кодирует запись и записывает ее в файл.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            exc_text = None
+            if record.exc_info:
+                exc_text = record.exc_text or (self.formatter or logging.Formatter()).formatException(record.exc_info)
+            data = self.encoder.encode(record, exc_text)
+            if self.maxBytes > 0 and self._file_size + len(data) > self.maxBytes and self._file_size > len(
+                    SESSION_MAGIC):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                # После ротации таблица строк пуста: кодируем запись заново вместе с определениями строк
+                data = self.encoder.encode(record, exc_text)
+            self.stream.write(data)
+            self.stream.flush()
+            self._file_size += len(data)
+        except Exception:
+            self.handleError(record)
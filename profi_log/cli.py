@@ -0,0 +1,53 @@
+import argparse
+import sys
+from typing import List, Optional
+from .binary_format import DEFAULT_FORMAT, SESSION_MAGIC, decode_file
+from .mmap_handler import MAGIC, read_segment
+
+
+def decode(filenames: List[str], format_string: str) -> None:
+    """
+    Выводит содержимое двоичных логов и сегментов MmapFileHandler в текстовом виде.
+
+    Args:
+        filenames (List[str]): Имена файлов.
+        format_string (str): Строка форматирования записей двоичного лога.
+    """
+    for filename in filenames:
+        with open(filename, 'rb') as f:
+            header = f.read(len(MAGIC))
+        if header.startswith(MAGIC):
+            sys.stdout.write(read_segment(filename))
+        elif header.startswith(SESSION_MAGIC):
+            for line in decode_file(filename, format_string):
+                sys.stdout.write(line + '\n')
+        else:
+            raise ValueError(f"Неизвестный формат файла '{filename}'")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа команды ``profi_log``.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы командной строки. По умолчанию sys.argv.
+
+    Returns:
+        int: Код завершения.
+    """
+    parser = argparse.ArgumentParser(prog='profi_log', description='Утилиты для логов profi_log')
+    subparsers = parser.add_subparsers(dest='command')
+    decode_parser = subparsers.add_parser('decode', help='Преобразовать двоичный лог в текст')
+    decode_parser.add_argument('files', nargs='+', help='Файлы двоичного лога')
+    decode_parser.add_argument('--format', default=DEFAULT_FORMAT, help='Строка форматирования записей')
+
+    args = parser.parse_args(argv)
+    if args.command != 'decode':
+        parser.print_help()
+        return 2
+    try:
+        decode(args.files, args.format)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"profi_log: {e}\n")
+        return 1
+    return 0
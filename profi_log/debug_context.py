@@ -0,0 +1,105 @@
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from typing import Optional, Tuple
+from .handlers import DispatchingHandler
+from .scoped_level import has_scoped_level
+
+
+class DebugContextHandler(DispatchingHandler):
+    """
+    Обработчик, который откладывает подробные записи и выводит их только перед ошибкой.
+
+    Записи ниже buffer_below не форматируются и не передаются обработчикам, а сохраняются как есть
+    в кольцевом буфере текущего потока или задачи asyncio. Запись уровня flush_level и выше сначала
+    выводит накопленные записи своего потока или задачи, затем себя. Остальные записи передаются
+    обработчикам сразу. Записи, уровень которых запрошен через temporary_log_level в текущем потоке
+    или задаче, также передаются обработчикам сразу.
+
+    Записи хранятся вместе с аргументами сообщения, поэтому изменяемые аргументы, измененные
+    после вызова логгера, будут выведены в измененном виде.
+
+    Если задан parent, выведенные записи передаются также обработчикам parent и его предков,
+    как при propagate. Так отложенные записи не попадают к обработчикам предков в обход буфера,
+    если у логгера с этим обработчиком отключен propagate.
+    """
+
+    def __init__(self, capacity: int, buffer_below: int = logging.INFO, flush_level: int = logging.ERROR):
+        """
+        Инициализация DebugContextHandler.
+
+        Args:
+            capacity (int): Количество последних записей в буфере каждого потока или задачи.
+            buffer_below (int): Записи ниже этого уровня откладываются в буфер. По умолчанию INFO.
+            flush_level (int): Записи этого уровня и выше выводят буфер. По умолчанию ERROR.
+
+        Raises:
+            ValueError: Если capacity меньше 1.
+        """
+        if capacity < 1:
+            raise ValueError("capacity должен быть больше 0")
+        super().__init__()
+        self.capacity = capacity
+        self.buffer_below = buffer_below
+        self.flush_level = flush_level
+        self.parent: Optional[logging.Logger] = None
+        # Значение - пара (задача asyncio или None, буфер). Новый поток начинает с пустого контекста,
+        # а задача получает копию контекста создателя, поэтому владельца буфера проверяем явно
+        self._ring: contextvars.ContextVar[Tuple[Optional[asyncio.Task], deque]] = \
+            contextvars.ContextVar(f'profi_log_debug_context_{id(self)}')
+
+    def _current_ring(self) -> deque:
+        loop = asyncio._get_running_loop()
+        owner = asyncio.current_task(loop) if loop is not None else None
+        value = self._ring.get(None)
+        if value is None or value[0] is not owner:
+            value = (owner, deque(maxlen=self.capacity))
+            self._ring.set(value)
+        return value[1]
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Откладывает запись в буфер либо передает ее обработчикам, выводя перед ошибкой накопленные записи.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        if self.buffer(record):
+            return
+        if record.levelno >= self.flush_level:
+            ring = self._current_ring()
+            while ring:
+                self._dispatch(ring.popleft())
+        self._dispatch(record)
+
+    def _dispatch(self, record: logging.LogRecord) -> None:
+        super()._dispatch(record)
+        # Повторяет обход предков из Logger.callHandlers, но без lastResort: у логгера уже есть обработчики
+        logger = self.parent
+        while logger is not None:
+            for handler in logger.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            logger = logger.parent if logger.propagate else None
+
+    def buffer(self, record: logging.LogRecord) -> bool:
+        """
+        Откладывает запись в буфер текущего потока или задачи, если ее не нужно выводить сразу.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            bool: True, если запись отложена.
+        """
+        if record.levelno < self.buffer_below and not has_scoped_level(record):
+            self._current_ring().append(record)
+            return True
+        return False
+
+    def discard(self) -> None:
+        """
+        Очищает буфер текущего потока или задачи, например после успешной обработки запроса.
+        """
+        self._current_ring().clear()
@@ -0,0 +1,362 @@
+import hashlib
+import logging
+import queue
+import smtplib
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional, Tuple
+
+_STOP = object()
+_FLUSH = object()
+
+
+class SMTPConnection:
+    """
+    Постоянное авторизованное SMTP-соединение с переподключением при обрыве.
+    """
+
+    def __init__(self, smtp_server: str, port: int, sender: str, password: Optional[str], use_tls: bool = True,
+                 timeout: Optional[float] = None, smtp_factory: Optional[Callable[..., smtplib.SMTP]] = None):
+        """
+        Инициализация SMTPConnection.
+
+        Args:
+            smtp_server (str): SMTP сервер.
+            port (int): Порт SMTP сервера.
+            sender (str): Email отправителя, он же логин.
+            password (Optional[str]): Пароль отправителя. Если не указан, авторизация не выполняется.
+            use_tls (bool): Выполнять STARTTLS после подключения. По умолчанию True.
+            timeout (Optional[float]): Таймаут сетевых операций в секундах.
+            smtp_factory (Optional[Callable[..., smtplib.SMTP]]): Фабрика SMTP-клиента. По умолчанию smtplib.SMTP.
+        """
+        self.smtp_server = smtp_server
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        factory = self.smtp_factory or smtplib.SMTP
+        if self.timeout is None:
+            smtp = factory(self.smtp_server, self.port)
+        else:
+            smtp = factory(self.smtp_server, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.password is not None:
+                smtp.login(self.sender, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def send(self, msg: EmailMessage) -> None:
+        """
+        Отправляет письмо, при необходимости устанавливая соединение.
+
+        Args:
+            msg (EmailMessage): Письмо.
+
+        Raises:
+            smtplib.SMTPException: Если отправить письмо не удалось. Ошибки сервера (например, отказ
+                получателю) не приводят к переподключению.
+            OSError: Если соединение с сервером недоступно.
+        """
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout):
+            # Сервер мог закрыть простаивающее соединение: переподключаемся один раз.
+            # Остальные SMTPException - наследники OSError, но относятся к письму, а не к соединению
+            self.close()
+            self._smtp = self._connect()
+            self._smtp.send_message(msg)
+
+    def close(self) -> None:
+        """
+        Закрывает соединение с сервером.
+        """
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+
+def record_fingerprint(record: logging.LogRecord) -> Tuple[str, str]:
+    """
+    Вычисляет отпечаток записи по имени логгера, шаблону сообщения, типу и месту исключения.
+
+    Args:
+        record (logging.LogRecord): Запись лога.
+
+    Returns:
+        Tuple[str, str]: Отпечаток и его читаемое описание.
+    """
+    if isinstance(record.msg, str):
+        template = record.msg
+    else:
+        # Для отложенных сообщений (например, log_exception) шаблоном считается первая строка
+        template = str(record.msg).split('\n', 1)[0]
+    exc_type, _, tb = record.exc_info or sys.exc_info()
+    exc_name = exc_type.__qualname__ if exc_type is not None else ''
+    location = ''
+    if tb is not None:
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        location = f"{tb.tb_frame.f_code.co_filename}:{tb.tb_lineno}"
+    key = '\0'.join((record.name, template, exc_name, location))
+    fingerprint = hashlib.blake2b(key.encode('utf-8', 'replace'), digest_size=8).hexdigest()
+    description = f"{record.name}: {template}"
+    if exc_name:
+        description += f" [{exc_name} {location}]"
+    return fingerprint, description
+
+
+class FingerprintTable:
+    """
+    Ограниченная таблица отпечатков с вытеснением по LRU и сроку жизни окна.
+    """
+
+    def __init__(self, window: float, max_size: int = 1000):
+        """
+        Инициализация FingerprintTable.
+
+        Args:
+            window (float): Окно дедупликации в секундах.
+            max_size (int): Максимальное количество отпечатков в таблице. По умолчанию 1000.
+        """
+        self.window = window
+        self.max_size = max_size
+        # отпечаток -> [начало окна, число повторов, описание]
+        self._entries: 'OrderedDict[str, list]' = OrderedDict()
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, fingerprint: str, description: str) -> bool:
+        """
+        Регистрирует появление записи.
+
+        Args:
+            fingerprint (str): Отпечаток записи.
+            description (str): Описание для сводки повторов.
+
+        Returns:
+            bool: True для первого появления в окне (запись нужно отправить), False для повтора.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                self._entries.move_to_end(fingerprint)
+                return False
+            if entry is not None:
+                self._carry(entry)
+            self._entries[fingerprint] = [now, 0, description]
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._carry(evicted)
+            return True
+
+    def _carry(self, entry: list) -> None:
+        if entry[1]:
+            self._pending[entry[2]] = self._pending.get(entry[2], 0) + entry[1]
+
+    def take_repeats(self) -> List[Tuple[str, int]]:
+        """
+        Возвращает накопленные повторы и обнуляет их счетчики.
+
+        Returns:
+            List[Tuple[str, int]]: Пары (описание, количество повторов).
+        """
+        with self._lock:
+            for entry in self._entries.values():
+                self._carry(entry)
+                entry[1] = 0
+            repeats, self._pending = self._pending, {}
+        return sorted(repeats.items(), key=lambda item: -item[1])
+
+
+class BackgroundEmailHandler(logging.Handler):
+    """
+    Обработчик, отправляющий записи по электронной почте из фонового потока.
+
+    Записи, поступившие в течение batch_window секунд, объединяются в одно письмо-дайджест.
+    Неудачная отправка повторяется с экспоненциально растущей паузой.
+
+    При включенной дедупликации повторы записи с тем же отпечатком в течение dedup_window секунд
+    не отправляются, а учитываются счетчиком в следующем письме.
+    """
+
+    def __init__(self, connection: SMTPConnection, recipients: List[str], subject_prefix: str = "Критическая ошибка",
+                 batch_window: float = 5.0, max_batch: int = 100, max_retries: int = 3, retry_backoff: float = 1.0,
+                 queue_size: int = 1000, dedup_window: float = 0.0, max_fingerprints: int = 1000):
+        """
+        Инициализация BackgroundEmailHandler.
+
+        Args:
+            connection (SMTPConnection): SMTP-соединение, которым владеет фоновый поток.
+            recipients (List[str]): Список получателей.
+            subject_prefix (str): Префикс для темы письма. По умолчанию "Критическая ошибка".
+            batch_window (float): Время накопления записей для одного письма в секундах. По умолчанию 5.
+            max_batch (int): Максимальное количество записей в одном письме. По умолчанию 100.
+            max_retries (int): Количество повторных попыток отправки. По умолчанию 3.
+            retry_backoff (float): Пауза перед первой повторной попыткой в секундах, далее удваивается.
+                По умолчанию 1.
+            queue_size (int): Максимальное количество записей, ожидающих отправки. По умолчанию 1000.
+            dedup_window (float): Окно дедупликации в секундах. 0 - без дедупликации. По умолчанию 0.
+            max_fingerprints (int): Максимальное количество отпечатков в таблице дедупликации. По умолчанию 1000.
+        """
+        super().__init__()
+        self.connection = connection
+        self.recipients = recipients
+        self.subject_prefix = subject_prefix
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.dropped = 0
+        self._fingerprints = FingerprintTable(dedup_window, max_fingerprints) if dedup_window > 0 else None
+        self._idle_timeout = dedup_window if dedup_window > 0 else None
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profi_log-email', daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Помещает запись в очередь отправки.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        if self._fingerprints is not None and not self._fingerprints.hit(*record_fingerprint(record)):
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                # Новых записей нет: отправляем накопившиеся повторы отдельным письмом
+                self._send_batch([])
+                continue
+            taken = 1
+            batch: List[logging.LogRecord] = []
+            stop = item is _STOP
+            if item is not _STOP and item is not _FLUSH:
+                batch.append(item)
+                deadline = time.monotonic() + self.batch_window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if item is _FLUSH:
+                        break
+                    batch.append(item)
+            try:
+                self._send_batch(batch)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def build_message(self, batch: List[logging.LogRecord],
+                      repeats: Optional[List[Tuple[str, int]]] = None) -> EmailMessage:
+        """
+        Формирует письмо для одной записи или дайджест для нескольких.
+
+        Args:
+            batch (List[logging.LogRecord]): Записи для отправки.
+            repeats (Optional[List[Tuple[str, int]]]): Повторы, подавленные дедупликацией.
+
+        Returns:
+            EmailMessage: Готовое письмо.
+        """
+        parts = [self.format(record) for record in batch]
+        if repeats:
+            lines = [f"{count:,} × {description}" for description, count in repeats]
+            parts.append("Повторы, не отправленные отдельно:\n" + '\n'.join(lines))
+
+        msg = EmailMessage()
+        if not batch:
+            total = sum(count for _, count in repeats or ())
+            msg['Subject'] = f"{self.subject_prefix}: повторов {total:,}"
+        else:
+            first_line = (batch[0].getMessage().splitlines() or [''])[0]
+            if len(batch) == 1:
+                msg['Subject'] = f"{self.subject_prefix}: {first_line}"
+            else:
+                msg['Subject'] = f"{self.subject_prefix}: {first_line} (и еще {len(batch) - 1})"
+        msg.set_content('\n\n'.join(parts))
+        msg['From'] = self.connection.sender
+        msg['To'] = ', '.join(self.recipients)
+        return msg
+
+    def _send_batch(self, batch: List[logging.LogRecord]) -> None:
+        repeats = self._fingerprints.take_repeats() if self._fingerprints is not None else []
+        if not batch and not repeats:
+            return
+        try:
+            msg = self.build_message(batch, repeats)
+        except Exception:
+            if batch:
+                self.handleError(batch[0])
+            return
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.connection.send(msg)
+                return
+            except (smtplib.SMTPException, OSError):
+                self.connection.close()
+                if attempt == self.max_retries:
+                    if batch:
+                        self.handleError(batch[0])
+                    return
+                # При остановке не ждем: последняя попытка будет сделана сразу
+                self._stop_event.wait(self.retry_backoff * 2 ** attempt)
+
+    def flush(self) -> None:
+        """
+        Немедленно отправляет накопленные записи и дожидается завершения отправки.
+        """
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Отправляет оставшиеся записи, останавливает фоновый поток и закрывает соединение.
+        """
+        if self._thread.is_alive():
+            self._stop_event.set()
+            self._queue.put(_STOP)
+            self._thread.join()
+        self.connection.close()
+        super().close()
@@ -0,0 +1,327 @@
+import json
+import logging
+import operator
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import colorlog
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TIMESTAMP_STYLES = ('local', 'iso_utc', 'epoch_ns')
+
+# Поле %(name)s с необязательными флагами, шириной и точностью либо экранированный знак %%
+FORMAT_FIELD = re.compile(r'%\((\w+)\)([#0+ -]*\d*(?:\.\d+)?[diouxXeEfFgGcrsa])|%%')
+
+# Стандартные атрибуты LogRecord; все остальные атрибуты записи считаются полями extra
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def json_dumps(value: Any) -> str:
+    """
+    Сериализует значение в JSON самым быстрым доступным сериализатором (orjson, если установлен).
+
+    Args:
+        value (Any): Значение для сериализации. Неподдерживаемые объекты преобразуются через str().
+
+    Returns:
+        str: JSON-строка.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # orjson не сериализует целые за пределами 64 бит и ключи словарей некоторых типов
+            pass
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class CachedTimeMixin:
+    """
+    Примесь к logging.Formatter, кэширующая форматирование времени.
+
+    Часть времени с точностью до секунды форматируется через strftime только при смене секунды,
+    для остальных записей к ней добавляются только миллисекунды.
+    """
+
+    timestamp = 'local'
+    _time_cache: Tuple[Optional[int], str] = (None, '')
+
+    def _set_timestamp(self, timestamp: str) -> None:
+        if timestamp not in TIMESTAMP_STYLES:
+            raise ValueError(f"Неизвестный формат времени: '{timestamp}'")
+        self.timestamp = timestamp
+        self._time_cache = (None, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """
+        Форматирует время записи.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+            datefmt (Optional[str]): Формат даты для strftime.
+
+        Returns:
+            str: Время в стиле, выбранном параметром timestamp: 'local' - как logging.Formatter,
+                'iso_utc' - ISO-8601 в UTC с миллисекундами, 'epoch_ns' - наносекунды с начала эпохи.
+        """
+        if self.timestamp == 'epoch_ns':
+            return str(int(record.created * 1_000_000_000))
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            if self.timestamp == 'iso_utc':
+                prefix = time.strftime(datefmt or '%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            else:
+                prefix = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            # Кортеж заменяется одной операцией, поэтому потоки не увидят секунду и строку от разных записей
+            self._time_cache = (second, prefix)
+        if datefmt:
+            return prefix
+        if self.timestamp == 'iso_utc':
+            return f'{prefix}.{int(record.msecs):03d}Z'
+        if self.default_msec_format:
+            return self.default_msec_format % (prefix, record.msecs)
+        return prefix
+
+
+class CachedFormatter(CachedTimeMixin, logging.Formatter):
+    """
+    logging.Formatter с кэшированием форматирования времени.
+    """
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%',
+                 timestamp: str = 'local'):
+        """
+        Инициализация CachedFormatter.
+
+        Args:
+            fmt (Optional[str]): Строка форматирования записей.
+            datefmt (Optional[str]): Формат даты для strftime.
+            style (str): Стиль строки форматирования: '%', '{' или '$'. По умолчанию '%'.
+            timestamp (str): Формат времени: 'local', 'iso_utc' или 'epoch_ns'. По умолчанию 'local'.
+        """
+        super().__init__(fmt, datefmt, style)
+        self._set_timestamp(timestamp)
+
+
+class CachedColoredFormatter(CachedTimeMixin, colorlog.ColoredFormatter):
+    """
+    Цветной форматтер colorlog с кэшированием форматирования времени.
+    """
+
+    def __init__(self, *args: Any, timestamp: str = 'local', **kwargs: Any):
+        """
+        Инициализация CachedColoredFormatter.
+
+        Args:
+            *args (Any): Позиционные параметры colorlog.ColoredFormatter.
+            timestamp (str): Формат времени: 'local', 'iso_utc' или 'epoch_ns'. По умолчанию 'local'.
+            **kwargs (Any): Именованные параметры colorlog.ColoredFormatter.
+        """
+        super().__init__(*args, **kwargs)
+        self._set_timestamp(timestamp)
+
+
+class CompiledFormatMixin:
+    """
+    Примесь к logging.Formatter, которая разбирает строку форматирования в стиле '%' один раз.
+
+    Строка разбирается на текстовые фрагменты и поля записи: значения полей извлекаются одним
+    operator.itemgetter и подставляются в позиционный шаблон, без %-форматирования словаря записи.
+    Проверка использования asctime выполняется при разборе, а не для каждой записи.
+    """
+
+    def _compile(self, fmt: str) -> None:
+        # StrFormatStyle и StringTemplateStyle наследуют PercentStyle, поэтому сравниваем тип точно
+        if type(self._style) is not logging.PercentStyle:
+            raise ValueError("Поддерживается только стиль форматирования '%'")
+        parts: List[str] = []
+        keys: List[str] = []
+        position = 0
+        for match in FORMAT_FIELD.finditer(fmt):
+            parts.append(self._literal(fmt, fmt[position:match.start()]))
+            position = match.end()
+            if match.group(1) is None:
+                parts.append('%%')
+            else:
+                keys.append(match.group(1))
+                parts.append('%' + match.group(2))
+        parts.append(self._literal(fmt, fmt[position:]))
+        self._template = ''.join(parts)
+        if len(keys) == 1:
+            key = keys[0]
+            self._fields: Callable[[Dict[str, Any]], Tuple[Any, ...]] = lambda values: (values[key],)
+        else:
+            self._fields = operator.itemgetter(*keys)
+        self._uses_time = 'asctime' in keys
+
+    @staticmethod
+    def _literal(fmt: str, text: str) -> str:
+        if '%' in text:
+            raise ValueError(f"Некорректная строка форматирования: '{fmt}'")
+        return text
+
+    def usesTime(self) -> bool:
+        """
+        Проверяет, используется ли время в строке форматирования.
+
+        Returns:
+            bool: True, если строка содержит поле asctime.
+        """
+        return self._uses_time
+
+    def _render(self, values: Dict[str, Any]) -> str:
+        try:
+            return self._template % self._fields(values)
+        except KeyError as e:
+            raise ValueError(f"Поле форматирования не найдено в записи: {e}")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """
+        Собирает строку записи по разобранной строке форматирования.
+
+        Args:
+            record (logging.LogRecord): Запись лога с заполненными полями message и asctime.
+
+        Returns:
+            str: Отформатированная запись без трассировки исключения.
+        """
+        return self._render(record.__dict__)
+
+
+class CompiledFormatter(CompiledFormatMixin, CachedFormatter):
+    """
+    Форматтер с однократным разбором строки форматирования и кэшированием времени.
+
+    Совместим со строками форматирования logging.Formatter в стиле '%'.
+    """
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%',
+                 timestamp: str = 'local'):
+        """
+        Инициализация CompiledFormatter.
+
+        Args:
+            fmt (Optional[str]): Строка форматирования записей. По умолчанию '%(message)s'.
+            datefmt (Optional[str]): Формат даты для strftime.
+            style (str): Стиль строки форматирования. Поддерживается только '%'.
+            timestamp (str): Формат времени: 'local', 'iso_utc' или 'epoch_ns'. По умолчанию 'local'.
+
+        Raises:
+            ValueError: Если стиль не '%' или строка форматирования некорректна.
+        """
+        super().__init__(fmt, datefmt, style, timestamp)
+        self._compile(self._fmt)
+
+
+class CompiledColoredFormatter(CompiledFormatMixin, CachedColoredFormatter):
+    """
+    Цветной форматтер colorlog с однократным разбором строки форматирования и кэшированием времени.
+
+    Использует внутренние методы ColoredFormatter colorlog 6 (_escape_code_map, _append_reset),
+    поэтому версия colorlog ограничена в setup.py.
+    """
+
+    def __init__(self, fmt: Optional[str] = None, *args: Any, **kwargs: Any):
+        """
+        Инициализация CompiledColoredFormatter.
+
+        Args:
+            fmt (Optional[str]): Строка форматирования записей в стиле '%'.
+            *args (Any): Позиционные параметры colorlog.ColoredFormatter.
+            **kwargs (Any): Именованные параметры CachedColoredFormatter.
+
+        Raises:
+            ValueError: Если стиль не '%' или строка форматирования некорректна.
+        """
+        super().__init__(fmt, *args, **kwargs)
+        self._compile(self._fmt)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """
+        Собирает строку записи, подставляя цветовые коды colorlog.
+
+        Args:
+            record (logging.LogRecord): Запись лога с заполненными полями message и asctime.
+
+        Returns:
+            str: Отформатированная запись без трассировки исключения.
+        """
+        escapes = self._escape_code_map(record.levelname)
+        values = dict(record.__dict__)
+        values.update(escapes)
+        return self._append_reset(self._render(values), escapes)
+
+
+class JsonFormatter(CachedTimeMixin, logging.Formatter):
+    """
+    Форматтер, выводящий каждую запись одной JSON-строкой (JSON Lines).
+
+    Поля: timestamp, level, logger, message, а также exception и extra, если они есть.
+    Постоянная для логгера и уровня часть строки сериализуется один раз и переиспользуется.
+    """
+
+    def __init__(self, timestamp: str = 'iso_utc'):
+        """
+        Инициализация JsonFormatter.
+
+        Args:
+            timestamp (str): Формат поля timestamp: 'iso_utc' (строка ISO-8601), 'local' (строка
+                в формате logging.Formatter) или 'epoch_ns' (число наносекунд). По умолчанию 'iso_utc'.
+        """
+        super().__init__()
+        self._set_timestamp(timestamp)
+        self._fragments: Dict[Tuple[str, str], str] = {}
+
+    def _fragment(self, record: logging.LogRecord) -> str:
+        key = (record.name, record.levelname)
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = f',"level":{json_dumps(record.levelname)},"logger":{json_dumps(record.name)},"message":'
+            self._fragments[key] = fragment
+        return fragment
+
+    def format_timestamp(self, record: logging.LogRecord) -> str:
+        """
+        Возвращает время записи в виде значения JSON.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            str: Число для 'epoch_ns', строка в кавычках для остальных форматов.
+        """
+        if self.timestamp == 'epoch_ns':
+            return self.formatTime(record)
+        return f'"{self.formatTime(record)}"'
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Форматирует запись в JSON-строку.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            str: JSON-строка без перевода строки.
+        """
+        parts = ['{"timestamp":', self.format_timestamp(record), self._fragment(record),
+                 json_dumps(record.getMessage())]
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts.append(',"exception":')
+            parts.append(json_dumps(record.exc_text))
+        if record.stack_info:
+            parts.append(',"stack":')
+            parts.append(json_dumps(record.stack_info))
+        extra = {key: value for key, value in record.__dict__.items() if key not in RESERVED_ATTRS}
+        if extra:
+            parts.append(',"extra":')
+            parts.append(json_dumps(extra))
+        parts.append('}')
+        return ''.join(parts)
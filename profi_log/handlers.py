@@ -0,0 +1,309 @@
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import BinaryIO, List, Optional
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+
+def write_all(stream: BinaryIO, data: bytes) -> None:
+    """
+    Записывает данные в небуферизованный файл целиком.
+
+    FileIO.write может записать только часть данных, поэтому запись повторяется для остатка.
+
+    Args:
+        stream (BinaryIO): Файл, открытый с buffering=0.
+        data (bytes): Данные для записи.
+    """
+    view = memoryview(data)
+    while view:
+        view = view[stream.write(view):]
+
+
+class DispatchingHandler(logging.Handler):
+    """
+    Обработчик, который передает записи вложенным обработчикам с учетом их уровней.
+
+    Собственная блокировка обработчика не берется: вложенные обработчики берут свои блокировки сами.
+    """
+
+    def __init__(self):
+        """
+        Инициализация DispatchingHandler.
+        """
+        super().__init__()
+        self.handlers: List[logging.Handler] = []
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """
+        Применяет фильтры и передает запись в emit без блокировки обработчика.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            bool: Была ли запись пропущена фильтрами.
+        """
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Передает запись вложенным обработчикам.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        self._dispatch(record)
+
+    def _dispatch(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            handler.flush()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Обработчик, который только помещает запись в ограниченную очередь.
+
+    Форматирование и запись в файл выполняет поток QueueWriter, поэтому вызывающий поток
+    не выполняет ни одной операции ввода-вывода.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = 'block'):
+        """
+        Инициализация BoundedQueueHandler.
+
+        Args:
+            log_queue (queue.Queue): Очередь, из которой читает поток-писатель.
+            overflow_policy (str): Поведение при переполнении очереди: 'block' - ждать освобождения места,
+                'drop_oldest' - вытеснить самую старую запись, 'drop_newest' - отбросить новую запись.
+                По умолчанию 'block'.
+
+        Raises:
+            ValueError: Если указана неизвестная политика переполнения.
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: '{overflow_policy}'")
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Возвращает запись без изменений: форматирование откладывается до потока-писателя.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            logging.LogRecord: Та же запись.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Помещает запись в очередь согласно политике переполнения.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        if self.overflow_policy == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow_policy == 'drop_oldest':
+                self._replace_oldest(record)
+            else:
+                self._count_dropped()
+
+    def _replace_oldest(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self._count_dropped()
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._count_dropped()
+
+    def _count_dropped(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+class QueueWriter(QueueListener):
+    """
+    Выделенный поток, который забирает записи из очереди и передает их файловым обработчикам.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler):
+        """
+        Инициализация QueueWriter.
+
+        Args:
+            log_queue (queue.Queue): Очередь с записями лога.
+            *handlers (logging.Handler): Обработчики, которыми владеет поток-писатель.
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+
+    def start(self) -> None:
+        """
+        Запускает поток-писатель.
+        """
+        self._thread = threading.Thread(target=self._monitor, name='profi_log-writer', daemon=True)
+        self._thread.start()
+
+    def enqueue_sentinel(self) -> None:
+        # Очередь ограничена, поэтому ждем места для сигнала остановки, а не теряем его
+        self.queue.put(self._sentinel)
+
+    def flush(self) -> None:
+        """
+        Ожидает обработки всех записей в очереди и сбрасывает буферы обработчиков.
+        """
+        if self._thread is not None:
+            self.queue.join()
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        """
+        Дописывает оставшиеся записи, останавливает поток и сбрасывает буферы обработчиков.
+        """
+        if self._thread is not None:
+            super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Файловый обработчик с ротацией, который накапливает отформатированные записи в памяти
+    и записывает их в файл одним вызовом write.
+    """
+
+    def __init__(self, filename: str, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = None, delay: bool = False, buffer_bytes: int = 64 * 1024,
+                 buffer_records: int = 1000, flush_interval: int = 1000, flush_level: int = logging.ERROR):
+        """
+        Инициализация BufferedRotatingFileHandler.
+
+        Args:
+            filename (str): Имя файла для логов.
+            mode (str): Режим открытия файла. Используется только для совместимости с RotatingFileHandler.
+            maxBytes (int): Максимальный размер файла логов в байтах. 0 - без ротации.
+            backupCount (int): Количество резервных копий файлов логов.
+            encoding (Optional[str]): Кодировка файла логов. По умолчанию 'utf-8'.
+            delay (bool): Открывать файл только при первой записи.
+            buffer_bytes (int): Размер буфера в байтах, при достижении которого он записывается в файл.
+                По умолчанию 64 КБ.
+            buffer_records (int): Количество записей, при достижении которого буфер записывается в файл.
+                По умолчанию 1000.
+            flush_interval (int): Максимальное время хранения записи в буфере в миллисекундах.
+                0 - без ограничения по времени. По умолчанию 1000.
+            flush_level (int): Уровень, начиная с которого буфер записывается немедленно. По умолчанию ERROR.
+        """
+        self.buffer_bytes = buffer_bytes
+        self.buffer_records = buffer_records
+        self.flush_interval = flush_interval / 1000
+        self.flush_level = flush_level
+        self._buffer: List[bytes] = []
+        self._buffered_bytes = 0
+        self._buffer_started = 0.0
+        self._file_size = 0
+        super().__init__(filename, mode, maxBytes, backupCount, encoding or 'utf-8', delay)
+
+        self._stop_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self.flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_periodically, name='profi_log-flusher',
+                                             daemon=True)
+            self._flusher.start()
+
+    def _open(self) -> BinaryIO:
+        stream = open(self.baseFilename, 'ab', buffering=0)
+        self._file_size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Добавляет отформатированную запись в буфер и записывает буфер, если достигнут один из порогов.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+            if (record.levelno >= self.flush_level
+                    or self._buffered_bytes >= self.buffer_bytes
+                    or len(self._buffer) >= self.buffer_records
+                    or (self.flush_interval and time.monotonic() - self._buffer_started >= self.flush_interval)):
+                self._write_buffer()
+        except Exception:
+            self.handleError(record)
+
+    def _write_buffer(self) -> None:
+        if not self._buffer:
+            return
+        data = b''.join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0 and self._file_size and self._file_size + len(data) > self.maxBytes:
+            self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+        write_all(self.stream, data)
+        self._file_size += len(data)
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            self.acquire()
+            try:
+                if not self._stop_event.is_set():
+                    self._write_buffer()
+            finally:
+                self.release()
+
+    def flush(self) -> None:
+        """
+        Записывает накопленный буфер в файл.
+        """
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """
+        Останавливает фоновую запись, сохраняет буфер и закрывает файл.
+        """
+        self.acquire()
+        try:
+            self._stop_event.set()
+            self._write_buffer()
+            super().close()
+        finally:
+            self.release()
@@ -1,19 +1,118 @@
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import atexit
+import queue
+import threading
 import contextlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 import colorlog
-import traceback
-import smtplib
-from email.message import EmailMessage
+import sys
 import functools
-from typing import Optional, List, Callable, Any
+import inspect
+import time
+import weakref
+from typing import Optional, List, Callable, Any, Dict, Union
+from .handlers import BoundedQueueHandler, QueueWriter, BufferedRotatingFileHandler
+from .messages import LazyMessage
+from .reporting import PeriodicReporter
+from .sampling import CallSampler
+from .rate_limit import RATE_LIMIT_EXEMPT, RateLimitFilter
+from .scoped_level import ScopedLevelFilter
+from .profiling import LatencyHistogram
+from .email_handler import SMTPConnection, BackgroundEmailHandler
+from .mmap_handler import MmapFileHandler
+from .binary_format import BinaryFileHandler
+from .rotation import CompressedRotatingFileHandler, HybridRotatingFileHandler
+from .multiprocess_handler import MultiprocessFileHandler
+from .debug_context import DebugContextHandler
+from .tracebacks import ExceptionAggregator, TracebackRenderer, exception_fingerprint
+from .formatters import TIMESTAMP_STYLES, CompiledFormatter, CompiledColoredFormatter, JsonFormatter
+
+LEVEL_FLAGS = (
+    ('debug_enabled', logging.DEBUG),
+    ('info_enabled', logging.INFO),
+    ('warning_enabled', logging.WARNING),
+    ('error_enabled', logging.ERROR),
+    ('critical_enabled', logging.CRITICAL),
+)
+
+FILE_SINKS = {
+    'rotating': RotatingFileHandler,
+    'buffered': BufferedRotatingFileHandler,
+    'mmap': MmapFileHandler,
+    'binary': BinaryFileHandler,
+    'compressed': CompressedRotatingFileHandler,
+    'multiprocess': MultiprocessFileHandler,
+}
+
+ROTATION_POLICIES = ('size', 'time', 'both')
+
+# Экземпляры MasterLogger, флаги уровней которых пересчитываются при любом изменении уровней логгеров
+_level_watchers: 'weakref.WeakSet[MasterLogger]' = weakref.WeakSet()
+_level_watchers_lock = threading.Lock()
+_original_clear_cache: Optional[Callable[[], None]] = None
+
+
+def _clear_cache_and_refresh_flags() -> None:
+    _original_clear_cache()
+    for watcher in list(_level_watchers):
+        watcher._refresh_level_flags()
+
+
+def _watch_level_changes(master_logger: 'MasterLogger') -> None:
+    # Logger.setLevel и logging.disable сбрасывают кэш уровней через Manager._clear_cache: пока открыт
+    # хотя бы один MasterLogger, на общем logging.Logger.manager вместо метода стоит обертка, которая
+    # затем пересчитывает флаги уровней. Так флаги обновляются и при изменении уровня в обход MasterLogger
+    global _original_clear_cache
+    manager = logging.Logger.manager
+    with _level_watchers_lock:
+        if hasattr(manager, '_clear_cache') and vars(manager).get('_clear_cache') is not _clear_cache_and_refresh_flags:
+            _original_clear_cache = manager._clear_cache
+            manager._clear_cache = _clear_cache_and_refresh_flags
+        _level_watchers.add(master_logger)
+
+
+def _unwatch_level_changes(master_logger: 'MasterLogger') -> None:
+    # После закрытия последнего MasterLogger возвращаем исходный метод Manager._clear_cache
+    global _original_clear_cache
+    manager = logging.Logger.manager
+    with _level_watchers_lock:
+        _level_watchers.discard(master_logger)
+        if not _level_watchers and vars(manager).get('_clear_cache') is _clear_cache_and_refresh_flags:
+            if getattr(_original_clear_cache, '__self__', None) is manager:
+                del manager._clear_cache
+            else:
+                manager._clear_cache = _original_clear_cache
+            _original_clear_cache = None
+
+
+def _format_exception_message(renderer: TracebackRenderer, message: str, exc_info: tuple) -> str:
+    return f"{message}\n{renderer.render(*exc_info)}"
+
 
 class LoggerProxy:
     """
     Прокси-класс для объединения функциональности стандартного логгера и MasterLogger.
+
+    Методы уровней логирования и вспомогательные методы MasterLogger связываются один раз при создании,
+    поэтому вызов logger.info(...) через прокси не проходит через __getattr__.
+
+    Атрибуты debug_enabled, info_enabled, warning_enabled, error_enabled и critical_enabled
+    заранее вычислены и позволяют не формировать сообщение для отключенного уровня:
+    ``if logger.debug_enabled: logger.debug(f"...")``. Флаги пересчитываются при любом изменении уровней,
+    в том числе через logging.Logger.setLevel и logging.disable: для этого, пока открыт хотя бы один
+    MasterLogger, метод _clear_cache общего logging.Logger.manager подменяется оберткой. Метод
+    восстанавливается при закрытии последнего MasterLogger (close).
     """
 
+    _LOGGER_METHODS = ('debug', 'info', 'warning', 'error', 'critical', 'exception', 'log', 'isEnabledFor')
+    _MASTER_HELPERS = ('log_exception', 'log_function_call', 'temporary_log_level')
+
+    __slots__ = ('_logger', '_master_logger') + _LOGGER_METHODS + _MASTER_HELPERS + tuple(
+        flag for flag, _ in LEVEL_FLAGS)
+
     def __init__(self, logger: logging.Logger, master_logger: 'MasterLogger'):
         """
         Инициализация LoggerProxy.
@@ -24,10 +123,29 @@ class LoggerProxy:
         """
         self._logger = logger
         self._master_logger = master_logger
+        for name in self._LOGGER_METHODS:
+            setattr(self, name, getattr(logger, name))
+        for name in self._MASTER_HELPERS:
+            setattr(self, name, getattr(master_logger, name))
+        self._refresh_level_flags()
+
+    def _refresh_level_flags(self) -> None:
+        for flag, level in LEVEL_FLAGS:
+            setattr(self, flag, self._logger.isEnabledFor(level))
+
+    def setLevel(self, level: Any) -> None:
+        """
+        Устанавливает уровень логгера и обновляет флаги включенных уровней.
+
+        Args:
+            level (Any): Уровень логирования (число или имя уровня).
+        """
+        self._logger.setLevel(level)
+        self._master_logger._refresh_level_flags()
 
     def __getattr__(self, name: str) -> Any:
         """
-        Перехватывает обращения к атрибутам и методам.
+        Перехватывает обращения к атрибутам и методам, которые не были связаны при создании.
 
         Args:
             name (str): Имя атрибута или метода.
@@ -38,11 +156,16 @@ class LoggerProxy:
         Raises:
             AttributeError: Если атрибут не найден ни в logger, ни в master_logger.
         """
-        if hasattr(self._logger, name):
+        if name in ('_logger', '_master_logger'):
+            raise AttributeError(name)
+        try:
             return getattr(self._logger, name)
-        elif hasattr(self._master_logger, name):
+        except AttributeError:
+            pass
+        try:
             return getattr(self._master_logger, name)
-        raise AttributeError(f"'LoggerProxy' object has no attribute '{name}'")
+        except AttributeError:
+            raise AttributeError(f"'LoggerProxy' object has no attribute '{name}'") from None
 
 class MasterLogger:
     """
@@ -50,7 +173,13 @@ class MasterLogger:
     """
 
     def __init__(self, log_file_name: str, name: Optional[str] = None, max_bytes: int = 100 * 1024 * 1024,
-                 backup_count: int = 5, encoding: str = 'utf-8', level: str = 'INFO'):
+                 backup_count: int = 5, encoding: str = 'utf-8', level: str = 'INFO', async_mode: bool = False,
+                 queue_size: int = 10000, overflow_policy: str = 'block', file_sink: str = 'rotating',
+                 sink_options: Optional[Dict[str, Any]] = None, report_interval: float = 60.0,
+                 log_format: str = 'text', timestamp: Optional[str] = None, rotation: str = 'size',
+                 rotation_interval: str = 'daily', traceback_cache_size: int = 256,
+                 traceback_max_frames: Optional[int] = None, strip_library_frames: bool = False,
+                 exception_window: float = 0.0, exception_top: int = 10, debug_context: int = 0):
         """
         Инициализация MasterLogger.
 
@@ -61,12 +190,94 @@ class MasterLogger:
             backup_count (int): Количество резервных копий файлов логов. По умолчанию 5.
             encoding (str): Кодировка файла логов. По умолчанию 'utf-8'.
             level (str): Уровень логирования. По умолчанию 'INFO'.
+            async_mode (bool): Писать файл в отдельном потоке через очередь. По умолчанию False.
+            queue_size (int): Максимальное количество записей в очереди асинхронного режима.
+                0 - без ограничения. По умолчанию 10000.
+            overflow_policy (str): Поведение при переполнении очереди: 'block', 'drop_oldest' или 'drop_newest'.
+                По умолчанию 'block'.
+            file_sink (str): Тип файлового обработчика: 'rotating', 'buffered', 'mmap'
+                (сегмент, отображенный в память, размером max_bytes), 'binary' (двоичный формат,
+                текст восстанавливается командой ``profi_log decode``), 'compressed' (резервные копии
+                сжимаются в фоновом потоке) или 'multiprocess' (один файл для нескольких процессов,
+                например воркеров gunicorn). По умолчанию 'rotating'.
+            sink_options (Optional[Dict[str, Any]]): Дополнительные параметры файлового обработчика,
+                например buffer_bytes, buffer_records и flush_interval для 'buffered', segment_size для 'mmap'
+                или compression и max_total_bytes для 'compressed'.
+            report_interval (float): Интервал периодических сводок (пропущенные вызовы и т.п.) в секундах.
+                0 - сводки только по запросу через report(). По умолчанию 60.
+            log_format (str): Формат записей в файле: 'text' или 'json' (одна JSON-строка на запись).
+                По умолчанию 'text'.
+            timestamp (Optional[str]): Формат времени в записях: 'local' (локальное время, как в logging),
+                'iso_utc' (ISO-8601 в UTC) или 'epoch_ns' (наносекунды с начала эпохи).
+                По умолчанию 'iso_utc' для формата 'json' и 'local' для остальных.
+            rotation (str): Политика ротации: 'size' - по max_bytes, 'time' - каждый rotation_interval,
+                'both' - по тому, что наступит раньше. Для 'time' и 'both' закрытые файлы получают имя
+                с датой периода (app.log.2024-05-01), а backup_count ограничивает их количество.
+                Поддерживается только для file_sink='rotating'. По умолчанию 'size'.
+            rotation_interval (str): Период ротации по времени: 'hourly' или 'daily'. По умолчанию 'daily'.
+            traceback_cache_size (int): Количество отформатированных трассировок, кэшируемых log_exception.
+                По умолчанию 256.
+            traceback_max_frames (Optional[int]): Максимальное количество кадров трассировки в log_exception,
+                ближайших к месту исключения. По умолчанию без ограничения.
+            strip_library_frames (bool): Не выводить в log_exception кадры стандартной библиотеки
+                и установленных пакетов. По умолчанию False.
+            exception_window (float): Окно агрегации исключений в log_exception в секундах: первое появление
+                исключения с данной трассировкой выводится полностью, повторы в окне - одной строкой
+                с отпечатком и номером повтора. 0 - без агрегации. По умолчанию 0.
+            exception_top (int): Количество самых частых исключений в периодической сводке. По умолчанию 10.
+            debug_context (int): Количество последних записей ниже level, которые хранятся в памяти
+                для каждого потока и задачи asyncio и выводятся только перед записью ERROR
+                (в том числе из log_exception). Логгеры при этом получают уровень DEBUG, а у логгера
+                MasterLogger до close() отключается propagate: обработчикам предков записи передаются
+                после буфера. 0 - записи ниже level не создаются. По умолчанию 0.
+
+        Raises:
+            ValueError: Если указан неизвестный формат времени или debug_context меньше 0.
         """
+        if timestamp is not None and timestamp not in TIMESTAMP_STYLES:
+            raise ValueError(f"Неизвестный формат времени: '{timestamp}'")
+        if debug_context < 0:
+            raise ValueError("debug_context не может быть меньше 0")
         self.log_file_name = log_file_name
         self.max_bytes = max_bytes
         self.backup_count = backup_count
         self.encoding = encoding
         self.level = getattr(logging, level.upper())
+        self._debug_context: Optional[DebugContextHandler] = None
+        if debug_context > 0:
+            # Записи ниже level создаются, но до ошибки остаются в буфере и не форматируются
+            self._debug_context = DebugContextHandler(debug_context, buffer_below=self.level)
+            self.level = min(self.level, logging.DEBUG)
+        self.async_mode = async_mode
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.file_sink = file_sink
+        self.sink_options = sink_options or {}
+        self.log_format = log_format
+        self.timestamp = timestamp
+        self.rotation = rotation
+        self.rotation_interval = rotation_interval
+        self._traceback_renderer = TracebackRenderer(traceback_cache_size, traceback_max_frames,
+                                                     strip_library_frames)
+        self.exception_top = exception_top
+        self._exceptions: Optional[ExceptionAggregator] = None
+        if exception_window > 0:
+            self._exceptions = ExceptionAggregator(exception_window)
+        self._handlers: List[logging.Handler] = []
+        self._queue_handler: Optional[BoundedQueueHandler] = None
+        self._writer: Optional[QueueWriter] = None
+        self._proxies: Dict[str, LoggerProxy] = {}
+        self._proxies_lock = threading.Lock()
+        self._reporter = PeriodicReporter(report_interval)
+        self._samplers: List[CallSampler] = []
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._histograms_lock = threading.Lock()
+        if self._exceptions is not None:
+            self.add_report(self._report_exceptions)
+        self._rate_limits: Dict[str, RateLimitFilter] = {}
+        self._scoped_levels: Dict[str, ScopedLevelFilter] = {}
+        self._background_executor: Optional[ThreadPoolExecutor] = None
+        self._background_lock = threading.Lock()
 
         log_dir = os.path.dirname(log_file_name)
         if log_dir and not os.path.exists(log_dir):
@@ -74,21 +285,154 @@ class MasterLogger:
 
         self._root_logger = logging.getLogger(name) if name else logging.getLogger()
         self.setup_file_logging()
+        _watch_level_changes(self)
 
     def setup_file_logging(self) -> None:
         """
         Настройка логирования в файл.
+
+        Raises:
+            ValueError: Если указан неизвестный тип файлового обработчика, формат записей или политика ротации.
         """
-        handler = RotatingFileHandler(
-            self.log_file_name,
-            maxBytes=self.max_bytes,
-            backupCount=self.backup_count,
-            encoding=self.encoding
-        )
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        if self.file_sink not in FILE_SINKS:
+            raise ValueError(f"Неизвестный тип файлового обработчика: '{self.file_sink}'")
+        if self.log_format not in ('text', 'json'):
+            raise ValueError(f"Неизвестный формат записей: '{self.log_format}'")
+        if self.rotation not in ROTATION_POLICIES:
+            raise ValueError(f"Неизвестная политика ротации: '{self.rotation}'")
+        if self.rotation == 'size':
+            handler = FILE_SINKS[self.file_sink](
+                self.log_file_name,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding=self.encoding,
+                **self.sink_options
+            )
+        elif self.file_sink == 'rotating':
+            handler = HybridRotatingFileHandler(
+                self.log_file_name,
+                maxBytes=self.max_bytes if self.rotation == 'both' else 0,
+                backupCount=self.backup_count,
+                encoding=self.encoding,
+                when=self.rotation_interval,
+                **self.sink_options
+            )
+        else:
+            raise ValueError(f"Ротация по времени не поддерживается для file_sink='{self.file_sink}'")
+        if self.log_format == 'json':
+            formatter = JsonFormatter(self.timestamp or 'iso_utc')
+        else:
+            formatter = CompiledFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                          timestamp=self.timestamp or 'local')
         handler.setFormatter(formatter)
-        self._root_logger.addHandler(handler)
-        self._root_logger.setLevel(self.level)
+        if self.async_mode:
+            self._setup_queue(handler)
+        else:
+            self._add_handler(handler)
+        self._set_logger_level(self._root_logger, self.level)
+        self._refresh_level_flags()
+
+    def _setup_queue(self, handler: logging.Handler) -> None:
+        """
+        Передает обработчик потоку-писателю и подключает к логгеру обработчик очереди.
+
+        Args:
+            handler (logging.Handler): Обработчик, которым будет владеть поток-писатель.
+        """
+        self._writer = QueueWriter(queue.Queue(self.queue_size), handler)
+        self._queue_handler = BoundedQueueHandler(self._writer.queue, self.overflow_policy)
+        self._add_handler(self._queue_handler)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _add_handler(self, handler: logging.Handler) -> None:
+        if self._debug_context is not None:
+            # Обработчики подключаются за буфером контекста ошибок
+            if self._debug_context not in self._handlers:
+                self._handlers.append(self._debug_context)
+                self._root_logger.addHandler(self._debug_context)
+                if self._root_logger.propagate and self._root_logger.parent is not None:
+                    # Логгер получает уровень DEBUG: записи передаются предкам только после буфера
+                    self._debug_context.parent = self._root_logger.parent
+                    self._root_logger.propagate = False
+            self._debug_context.handlers.append(handler)
+        else:
+            self._root_logger.addHandler(handler)
+        self._handlers.append(handler)
+
+    def discard_debug_context(self) -> None:
+        """
+        Очищает записи, накопленные для вывода перед ошибкой в текущем потоке или задаче asyncio.
+
+        Полезно в конце успешно обработанного запроса, если поток обрабатывает запросы по очереди.
+        """
+        if self._debug_context is not None:
+            self._debug_context.discard()
+
+    @property
+    def dropped_records(self) -> int:
+        """
+        Количество записей, отброшенных из-за переполнения очереди асинхронного режима.
+
+        Returns:
+            int: Число отброшенных записей.
+        """
+        return self._queue_handler.dropped if self._queue_handler is not None else 0
+
+    def flush(self) -> None:
+        """
+        Дожидается записи всех накопленных логов и сбрасывает буферы обработчиков.
+        """
+        if self._background_executor is not None:
+            self._background_executor.submit(lambda: None).result()
+        if self._writer is not None:
+            self._writer.flush()
+        for handler in self._handlers:
+            handler.flush()
+
+    def add_report(self, callback: Callable[[], None]) -> None:
+        """
+        Регистрирует функцию, которая будет вызываться каждые report_interval секунд и при закрытии.
+
+        Args:
+            callback (Callable[[], None]): Функция, формирующая отчет через MasterLogger.
+        """
+        self._reporter.add(callback)
+
+    def report(self) -> None:
+        """
+        Немедленно выводит все периодические сводки.
+        """
+        self._reporter.report()
+
+    def close(self) -> None:
+        """
+        Выводит итоговые сводки, дописывает оставшиеся записи, отключает и закрывает все обработчики MasterLogger.
+        """
+        self._reporter.stop()
+        self._reporter.report()
+        _unwatch_level_changes(self)
+        if self._background_executor is not None:
+            self._background_executor.shutdown(wait=True)
+            self._background_executor = None
+        if self._writer is not None:
+            self._writer.stop()
+            for handler in self._writer.handlers:
+                handler.close()
+            self._writer = None
+            atexit.unregister(self.close)
+        for handler in self._handlers:
+            self._root_logger.removeHandler(handler)
+            handler.close()
+        self._handlers = []
+        if self._debug_context is not None and self._debug_context.parent is not None:
+            self._debug_context.parent = None
+            self._root_logger.propagate = True
+        with self._proxies_lock:
+            for name, limit in self._rate_limits.items():
+                for logger in self._loggers_under(name):
+                    logger.removeFilter(limit)
+            self._rate_limits = {}
 
     def setup_colored_console_logging(self, format_string: Optional[str] = None) -> None:
         """
@@ -102,7 +446,7 @@ class MasterLogger:
             format_string = '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
         handler = colorlog.StreamHandler()
-        handler.setFormatter(colorlog.ColoredFormatter(
+        handler.setFormatter(CompiledColoredFormatter(
             format_string,
             log_colors={
                 'DEBUG': 'cyan',
@@ -110,90 +454,470 @@ class MasterLogger:
                 'WARNING': 'yellow',
                 'ERROR': 'red',
                 'CRITICAL': 'red,bg_white',
-            }
+            },
+            timestamp=self.timestamp or 'local'
         ))
-        self._root_logger.addHandler(handler)
+        self._add_handler(handler)
 
     def get_logger(self, name: str) -> LoggerProxy:
         """
-        Создает и возвращает именованный логгер.
+        Возвращает именованный логгер. Для каждого имени прокси создается один раз и затем берется из реестра.
 
         Args:
-            name (str): Имя для нового логгера.
+            name (str): Имя логгера.
 
         Returns:
             LoggerProxy: Прокси-объект, объединяющий функциональность стандартного логгера и MasterLogger.
         """
-        logger = logging.getLogger(name)
-        logger.setLevel(self.level)
-        return LoggerProxy(logger, self)
+        proxy = self._proxies.get(name)
+        if proxy is not None:
+            return proxy
+        with self._proxies_lock:
+            proxy = self._proxies.get(name)
+            if proxy is None:
+                logger = logging.getLogger(name)
+                level_changed = self._set_logger_level(logger, self.level)
+                # Лимиты родительских логгеров действуют и на дочерние
+                for limit_name, limit in self._rate_limits.items():
+                    if self._is_under(logger.name, limit_name):
+                        logger.addFilter(limit)
+                proxy = LoggerProxy(logger, self)
+                self._proxies[name] = proxy
+                if level_changed:
+                    self._refresh_level_flags()
+        return proxy
+
+    def get_registered_loggers(self) -> Dict[str, LoggerProxy]:
+        """
+        Возвращает логгеры, созданные через get_logger.
+
+        Returns:
+            Dict[str, LoggerProxy]: Копия реестра прокси, ключ - имя логгера.
+        """
+        with self._proxies_lock:
+            return dict(self._proxies)
+
+    def configure_loggers(self, level: str, names: Optional[List[str]] = None) -> None:
+        """
+        Изменяет уровень логирования сразу для нескольких логгеров, созданных через get_logger.
+
+        Args:
+            level (str): Новый уровень логирования.
+            names (Optional[List[str]]): Имена логгеров. Если не указаны, изменяются все зарегистрированные логгеры.
+
+        Raises:
+            KeyError: Если логгер с указанным именем не зарегистрирован.
+        """
+        new_level = getattr(logging, level.upper())
+        with self._proxies_lock:
+            proxies = [self._proxies[name] for name in names] if names is not None else list(self._proxies.values())
+        level_changed = False
+        for proxy in proxies:
+            level_changed |= self._set_logger_level(proxy._logger, new_level)
+        if level_changed:
+            self._refresh_level_flags()
+
+    def set_rate_limit(self, level: str, rate: Optional[float], burst: Optional[float] = None,
+                       names: Optional[List[str]] = None) -> None:
+        """
+        Ограничивает частоту записей указанного уровня для логгеров.
+
+        Лимит действует на логгер и все его дочерние логгеры, в том числе созданные позже через get_logger,
+        и расходуется ими совместно. Записи сверх лимита отбрасываются, их количество периодически
+        выводится сводкой (см. report_interval).
+
+        Args:
+            level (str): Уровень логирования, например 'INFO'. Записи других уровней не ограничиваются.
+            rate (Optional[float]): Максимальная средняя частота записей в секунду. None - снять лимит.
+            burst (Optional[float]): Максимальное количество записей подряд. По умолчанию равно rate.
+            names (Optional[List[str]]): Имена логгеров. Если не указаны, лимит задается для основного логгера.
+
+        Raises:
+            ValueError: Если параметры лимита некорректны.
+        """
+        levelno = getattr(logging, level.upper())
+        names = names if names is not None else [self._root_logger.name]
+        with self._proxies_lock:
+            for name in names:
+                limit = self._rate_limits.get(name)
+                if rate is None:
+                    if limit is not None:
+                        limit.remove_limit(levelno)
+                    continue
+                if limit is None:
+                    limit = RateLimitFilter(name)
+                    if not self._rate_limits:
+                        self.add_report(self._report_rate_limited)
+                    self._rate_limits[name] = limit
+                    for logger in self._loggers_under(name):
+                        logger.addFilter(limit)
+                limit.set_limit(levelno, rate, burst)
+
+    @staticmethod
+    def _is_under(name: str, parent: str) -> bool:
+        return parent == 'root' or name == parent or name.startswith(parent + '.')
+
+    def _loggers_under(self, name: str) -> List[logging.Logger]:
+        loggers = [logging.getLogger() if name == 'root' else logging.getLogger(name)]
+        for logger_name, logger in list(logging.Logger.manager.loggerDict.items()):
+            if isinstance(logger, logging.Logger) and logger_name != name and self._is_under(logger_name, name):
+                loggers.append(logger)
+        return loggers
+
+    def set_level(self, level: str) -> None:
+        """
+        Изменяет уровень логирования основного логгера.
+
+        Args:
+            level (str): Новый уровень логирования.
+        """
+        if self._set_logger_level(self._root_logger, getattr(logging, level.upper())):
+            self._refresh_level_flags()
+
+    @staticmethod
+    def _set_logger_level(logger: logging.Logger, level: int) -> bool:
+        # setLevel сбрасывает кэш уровней всех логгеров, поэтому вызываем его только при реальном изменении
+        if logger.level == level:
+            return False
+        logger.setLevel(level)
+        return True
+
+    def _refresh_level_flags(self) -> None:
+        """
+        Пересчитывает флаги включенных уровней для MasterLogger и всех зарегистрированных прокси.
+        """
+        for flag, level in LEVEL_FLAGS:
+            setattr(self, flag, self._root_logger.isEnabledFor(level))
+        for proxy in list(self._proxies.values()):
+            proxy._refresh_level_flags()
 
     @contextlib.contextmanager
-    def temporary_log_level(self, level: str) -> None:
+    def temporary_log_level(self, level: str, names: Optional[List[str]] = None) -> None:
         """
-        Контекстный менеджер для временного изменения уровня логирования.
+        Контекстный менеджер для временного изменения уровня логирования в текущем потоке или задаче asyncio.
+
+        Остальные потоки и задачи продолжают логировать с прежним уровнем. Пока временный уровень
+        ниже прежнего, записи этих уровней в других потоках создаются и отбрасываются фильтром,
+        а флаги debug_enabled и т.п. включены для всех потоков.
 
         Args:
             level (str): Временный уровень логирования.
+            names (Optional[List[str]]): Имена логгеров. Временный уровень действует на них и дочерние логгеры,
+                наследующие их уровень. Если не указаны, изменяется основной логгер.
 
         Yields:
             None
         """
-        old_level = self._root_logger.level
-        self._root_logger.setLevel(getattr(logging, level.upper()))
+        levelno = getattr(logging, level.upper())
+        names = names if names is not None else [self._root_logger.name]
+        with self._proxies_lock:
+            filters = [self._acquire_scoped_level(name, levelno) for name in names]
+        self._refresh_level_flags()
+        tokens = [level_filter.set(levelno) for level_filter in filters]
         try:
             yield
         finally:
-            self._root_logger.setLevel(old_level)
+            for level_filter, token in reversed(list(zip(filters, tokens))):
+                level_filter.reset(token)
+            with self._proxies_lock:
+                for name, level_filter in zip(names, filters):
+                    self._release_scoped_level(name, level_filter, levelno)
+            self._refresh_level_flags()
+
+    def _acquire_scoped_level(self, name: str, level: int) -> ScopedLevelFilter:
+        level_filter = self._scoped_levels.get(name)
+        if level_filter is None:
+            logger = logging.getLogger() if name == 'root' else logging.getLogger(name)
+            level_filter = ScopedLevelFilter(logger, self._saved_effective_level(logger))
+            level_filter.attach(self._loggers_inheriting(logger))
+            self._scoped_levels[name] = level_filter
+        level_filter.active.append(level)
+        self._set_logger_level(level_filter.logger, level_filter.logger_level())
+        return level_filter
+
+    def _release_scoped_level(self, name: str, level_filter: ScopedLevelFilter, level: int) -> None:
+        level_filter.active.remove(level)
+        if level_filter.active:
+            self._set_logger_level(level_filter.logger, level_filter.logger_level())
+            return
+        del self._scoped_levels[name]
+        level_filter.detach()
+        self._set_logger_level(level_filter.logger, level_filter.base_level)
+
+    def _saved_level(self, logger: logging.Logger) -> int:
+        # Уровень логгера без учета временных уровней, которые действуют в других потоках
+        level_filter = self._scoped_levels.get(logger.name)
+        return level_filter.base_level if level_filter is not None else logger.level
+
+    def _saved_effective_level(self, logger: Optional[logging.Logger]) -> int:
+        while logger is not None:
+            level = self._saved_level(logger)
+            if level != logging.NOTSET:
+                return level
+            logger = logger.parent
+        return logging.NOTSET
+
+    def _loggers_inheriting(self, logger: logging.Logger) -> List[logging.Logger]:
+        # Дочерние логгеры без собственного уровня создают записи по уровню ближайшего предка с уровнем
+        loggers = [logger]
+        for child in list(logging.Logger.manager.loggerDict.values()):
+            if not isinstance(child, logging.Logger) or child is logger:
+                continue
+            parent = child
+            while parent is not None and parent is not logger and self._saved_level(parent) == logging.NOTSET:
+                parent = parent.parent
+            if parent is logger:
+                loggers.append(child)
+        return loggers
 
     def log_exception(self, message: str, exc_info: bool = True) -> None:
         """
         Логирование исключения с полной трассировкой стека.
 
+        При включенной агрегации (exception_window) повтор исключения с той же трассировкой в пределах окна
+        выводится одной строкой с отпечатком и номером повтора, а самые частые исключения периодически
+        выводятся сводкой (см. report_interval).
+
         Args:
             message (str): Сообщение об ошибке.
             exc_info (bool): Флаг для включения информации об исключении. По умолчанию True.
         """
-        if exc_info:
-            self._root_logger.error(f"{message}\n{traceback.format_exc()}")
-        else:
+        if not self.error_enabled:
+            return
+        if not exc_info:
             self._root_logger.error(message)
-
-    def log_function_call(self, log_args: bool = True, log_result: bool = True) -> Callable:
+            return
+        current = sys.exc_info()
+        exc_type, exc_value, tb = current
+        if self._exceptions is not None and exc_type is not None:
+            fingerprint, description = exception_fingerprint(exc_type, tb)
+            occurrence = self._exceptions.hit(fingerprint, description)
+            if occurrence > 1:
+                self._root_logger.error("%s [исключение %s, повтор %d: %s: %s]", message, fingerprint, occurrence,
+                                        exc_type.__qualname__, exc_value)
+                return
+            message = f"{message} [исключение {fingerprint}]"
+        # Трассировка форматируется только если запись действительно будет выведена,
+        # стек повторяющегося исключения берется из кэша
+        self._root_logger.error(LazyMessage(_format_exception_message, self._traceback_renderer, message, current))
+
+    def log_function_call(self, log_args: bool = True, log_result: bool = True, sample_every: int = 1,
+                          sample_rate: float = 1.0, max_per_second: Optional[int] = None,
+                          histogram: bool = False) -> Callable:
         """
-        Декоратор для автоматического логирования вызовов функций.
+        Декоратор для автоматического логирования вызовов функций и времени их выполнения.
+
+        Поддерживаются обычные функции, корутины (async def), генераторы и асинхронные генераторы.
+        Для корутин и генераторов завершение логируется после реального окончания работы, а результатом
+        генератора считается его возвращаемое значение. Записи корутин и асинхронных генераторов
+        передаются обработчикам в фоновом потоке, поэтому цикл событий не блокируется на вводе-выводе.
+
+        Параметры сэмплирования позволяют логировать только часть вызовов горячих функций.
+        Количество пропущенных вызовов периодически выводится сводкой (см. report_interval).
 
         Args:
             log_args (bool): Флаг для логирования аргументов функции. По умолчанию True.
             log_result (bool): Флаг для логирования результата функции. По умолчанию True.
+            sample_every (int): Логировать каждый N-й вызов. По умолчанию 1 (каждый вызов).
+            sample_rate (float): Вероятность логирования вызова от 0 до 1. По умолчанию 1.0.
+            max_per_second (Optional[int]): Максимальное количество логируемых вызовов функции в секунду.
+            histogram (bool): Собирать гистограмму времени выполнения каждого вызова (включая пропущенные
+                при сэмплировании). p50/p95/p99/max выводятся сводкой и доступны через get_latency_stats().
+                По умолчанию False.
 
         Returns:
             Callable: Декоратор функции.
         """
         def decorator(func: Callable) -> Callable:
-            @functools.wraps(func)
-            def wrapper(*args: Any, **kwargs: Any) -> Any:
-                if log_args:
-                    self._root_logger.info(f"Вызов функции {func.__name__} с аргументами: {args}, {kwargs}")
-                else:
-                    self._root_logger.info(f"Вызов функции {func.__name__}")
-
-                result = func(*args, **kwargs)
+            call_message = f"Вызов функции {func.__name__}"
+            finish_message = f"Функция {func.__name__} завершила выполнение."
+            sampler = None
+            if sample_every != 1 or sample_rate != 1.0 or max_per_second is not None:
+                sampler = self._create_sampler(func.__qualname__, sample_every, sample_rate, max_per_second)
+            latency = self._get_histogram(f"{func.__module__}.{func.__qualname__}") if histogram else None
+
+            def start_call(args: tuple, kwargs: dict, emit: Callable[[Any], None]) -> Optional[bool]:
+                # None - вызов не нужно ни логировать, ни замерять
+                log_call = self.info_enabled and (sampler is None or sampler.should_log())
+                if not log_call and latency is None:
+                    return None
+                if log_call:
+                    # Аргументы и результат форматируются сразу: запись может выводиться в другом потоке
+                    # уже после того, как функция их изменила
+                    if log_args:
+                        emit(f"{call_message} с аргументами: {args}, {kwargs}")
+                    else:
+                        emit(call_message)
+                return log_call
+
+            def finish_call(log_call: bool, start: int, result: Any, emit: Callable[[Any], None]) -> None:
+                elapsed = time.perf_counter_ns() - start
+                if latency is not None:
+                    latency.record(elapsed)
+                if log_call:
+                    if log_result:
+                        emit(f"{finish_message} Результат: {result}. Время выполнения: {elapsed / 1e6:.3f} мс")
+                    else:
+                        emit(f"{finish_message} Время выполнения: {elapsed / 1e6:.3f} мс")
+
+            if inspect.iscoroutinefunction(func):
+                emit = functools.partial(self._emit_in_background, func)
+
+                @functools.wraps(func)
+                async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    log_call = start_call(args, kwargs, emit)
+                    if log_call is None:
+                        return await func(*args, **kwargs)
+                    start = time.perf_counter_ns()
+                    result = await func(*args, **kwargs)
+                    finish_call(log_call, start, result, emit)
+                    return result
+
+            elif inspect.isasyncgenfunction(func):
+                emit = functools.partial(self._emit_in_background, func)
+
+                @functools.wraps(func)
+                async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    log_call = start_call(args, kwargs, emit)
+                    start = time.perf_counter_ns()
+                    agen = func(*args, **kwargs)
+                    try:
+                        value = await agen.asend(None)
+                        while True:
+                            try:
+                                sent = yield value
+                            except GeneratorExit:
+                                await agen.aclose()
+                                raise
+                            except BaseException as exc:
+                                value = await agen.athrow(exc)
+                            else:
+                                value = await agen.asend(sent)
+                    except StopAsyncIteration:
+                        pass
+                    if log_call is not None:
+                        finish_call(log_call, start, None, emit)
+
+            elif inspect.isgeneratorfunction(func):
+                emit = self._root_logger.info
+
+                @functools.wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    log_call = start_call(args, kwargs, emit)
+                    if log_call is None:
+                        return (yield from func(*args, **kwargs))
+                    start = time.perf_counter_ns()
+                    result = yield from func(*args, **kwargs)
+                    finish_call(log_call, start, result, emit)
+                    return result
+
+            else:
+                emit = self._root_logger.info
+
+                @functools.wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    log_call = start_call(args, kwargs, emit)
+                    if log_call is None:
+                        return func(*args, **kwargs)
+                    start = time.perf_counter_ns()
+                    result = func(*args, **kwargs)
+                    finish_call(log_call, start, result, emit)
+                    return result
 
-                if log_result:
-                    self._root_logger.info(f"Функция {func.__name__} завершила выполнение. Результат: {result}")
-                else:
-                    self._root_logger.info(f"Функция {func.__name__} завершила выполнение.")
-
-                return result
             return wrapper
         return decorator
 
+    def _emit_in_background(self, func: Callable, msg: Any) -> None:
+        """
+        Создает и фильтрует запись в текущем потоке, а передает ее обработчикам в фоновом потоке.
+
+        Фильтры логгера (временный уровень, ограничение частоты) применяются в вызывающем потоке или задаче,
+        там же запись откладывается в буфер контекста ошибок (debug_context). Обработчики вызываются
+        в копии контекста вызывающего потока, поэтому видят те же значения ContextVar.
+
+        Args:
+            func (Callable): Декорированная функция, по которой заполняются файл, строка и имя функции записи.
+            msg (Any): Сообщение лога.
+        """
+        code = func.__code__
+        logger = self._root_logger
+        record = logger.makeRecord(logger.name, logging.INFO, code.co_filename, code.co_firstlineno, msg, (), None,
+                                   func=func.__name__)
+        if logger.disabled or not logger.filter(record):
+            return
+        if self._debug_context is not None and self._debug_context.buffer(record):
+            return
+        if self._background_executor is None:
+            with self._background_lock:
+                if self._background_executor is None:
+                    self._background_executor = ThreadPoolExecutor(max_workers=1,
+                                                                   thread_name_prefix='profi_log-background')
+        self._background_executor.submit(contextvars.copy_context().run, logger.callHandlers, record)
+
+    def _create_sampler(self, name: str, every: int, rate: float, max_per_second: Optional[int]) -> CallSampler:
+        sampler = CallSampler(name, every, rate, max_per_second)
+        if not self._samplers:
+            self.add_report(self._report_suppressed_calls)
+        self._samplers.append(sampler)
+        return sampler
+
+    def _get_histogram(self, name: str) -> LatencyHistogram:
+        with self._histograms_lock:
+            if not self._histograms:
+                self.add_report(self._report_latency)
+            return self._histograms.setdefault(name, LatencyHistogram(name))
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Возвращает статистику времени выполнения функций, декорированных с histogram=True.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Для каждой функции (ключ - модуль и полное имя функции) - количество
+                вызовов и p50/p95/p99/max в наносекундах с момента последней сводки.
+        """
+        return {name: latency.snapshot() for name, latency in list(self._histograms.items())}
+
+    def _report_latency(self) -> None:
+        for name, latency in list(self._histograms.items()):
+            stats = latency.snapshot(reset=True)
+            if stats['count']:
+                self._report(
+                    logging.INFO, f"{name}: вызовов {stats['count']:,}, p50 {stats['p50'] / 1e6:.3f} мс, "
+                    f"p95 {stats['p95'] / 1e6:.3f} мс, p99 {stats['p99'] / 1e6:.3f} мс, max {stats['max'] / 1e6:.3f} мс")
+
+    def _report_exceptions(self) -> None:
+        top = self._exceptions.take_top(self.exception_top)
+        if top:
+            lines = [f"  {count:,} × {fingerprint} {description}" for fingerprint, description, count in top]
+            self._report(logging.WARNING, "Самые частые исключения за период:\n" + '\n'.join(lines))
+
+    def _report_rate_limited(self) -> None:
+        for name, limit in list(self._rate_limits.items()):
+            for level, dropped in limit.take_dropped():
+                self._report(logging.INFO, f"{name} {logging.getLevelName(level)}: {dropped:,} записей отброшено "
+                                           f"ограничением частоты")
+
+    def _report_suppressed_calls(self) -> None:
+        for sampler in self._samplers:
+            suppressed = sampler.take_suppressed()
+            if suppressed:
+                self._report(logging.INFO, f"{sampler.name}: {suppressed:,} вызовов пропущено при сэмплировании")
+
+    def _report(self, level: int, msg: str) -> None:
+        # Сводки не ограничиваются set_rate_limit, иначе сводка об отброшенных записях сама была бы отброшена
+        self._root_logger.log(level, msg, extra={RATE_LIMIT_EXEMPT: True})
+
     def setup_email_logging(self, smtp_server: str, port: int, sender: str, password: str, recipients: List[str],
-                            subject_prefix: str = "Критическая ошибка") -> None:
+                            subject_prefix: str = "Критическая ошибка", batch_window: float = 5.0,
+                            max_batch: int = 100, max_retries: int = 3, retry_backoff: float = 1.0,
+                            use_tls: bool = True, timeout: Optional[float] = None, dedup_window: float = 0.0,
+                            max_fingerprints: int = 1000) -> None:
         """
         Настройка отправки критических логов по электронной почте.
 
+        Письма отправляются из фонового потока через постоянное SMTP-соединение, поэтому вызов
+        critical() не ждет сервер. Записи, поступившие в течение batch_window секунд, объединяются в одно письмо.
+
         Args:
             smtp_server (str): SMTP сервер.
             port (int): Порт SMTP сервера.
@@ -201,38 +925,45 @@ class MasterLogger:
             password (str): Пароль отправителя.
             recipients (List[str]): Список получателей.
             subject_prefix (str): Префикс для темы письма. По умолчанию "Критическая ошибка".
+            batch_window (float): Время накопления записей для одного письма в секундах. По умолчанию 5.
+            max_batch (int): Максимальное количество записей в одном письме. По умолчанию 100.
+            max_retries (int): Количество повторных попыток отправки. По умолчанию 3.
+            retry_backoff (float): Пауза перед первой повторной попыткой в секундах, далее удваивается.
+                По умолчанию 1.
+            use_tls (bool): Выполнять STARTTLS после подключения. По умолчанию True.
+            timeout (Optional[float]): Таймаут сетевых операций SMTP в секундах.
+            dedup_window (float): Окно дедупликации в секундах: повторы записи с тем же отпечатком
+                (логгер, шаблон сообщения, тип и место исключения) не отправляются сразу, а учитываются
+                счетчиком в следующем письме. 0 - без дедупликации. По умолчанию 0.
+            max_fingerprints (int): Максимальное количество отпечатков в таблице дедупликации. По умолчанию 1000.
         """
-        class EmailHandler(logging.Handler):
-            def emit(self, record: logging.LogRecord) -> None:
-                msg = EmailMessage()
-                msg.set_content(self.format(record))
-                msg['Subject'] = f"{subject_prefix}: {record.getMessage()}"
-                msg['From'] = sender
-                msg['To'] = ', '.join(recipients)
-
-                with smtplib.SMTP(smtp_server, port) as server:
-                    server.starttls()
-                    server.login(sender, password)
-                    server.send_message(msg)
-
-        handler = EmailHandler()
+        connection = SMTPConnection(smtp_server, port, sender, password, use_tls=use_tls, timeout=timeout)
+        handler = BackgroundEmailHandler(connection, recipients, subject_prefix, batch_window=batch_window,
+                                         max_batch=max_batch, max_retries=max_retries, retry_backoff=retry_backoff,
+                                         dedup_window=dedup_window, max_fingerprints=max_fingerprints)
         handler.setLevel(logging.CRITICAL)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        formatter = CompiledFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                      timestamp=self.timestamp or 'local')
         handler.setFormatter(formatter)
-        self._root_logger.addHandler(handler)
+        self._add_handler(handler)
 
-    # Методы для прямого логирования
-    def debug(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._root_logger.debug(msg, *args, **kwargs)
+    # Методы для прямого логирования. Отключенный уровень отсекается по заранее вычисленному флагу.
+    def debug(self, msg: Union[str, LazyMessage], *args: Any, **kwargs: Any) -> None:
+        if self.debug_enabled:
+            self._root_logger.debug(msg, *args, **kwargs)
 
-    def info(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._root_logger.info(msg, *args, **kwargs)
+    def info(self, msg: Union[str, LazyMessage], *args: Any, **kwargs: Any) -> None:
+        if self.info_enabled:
+            self._root_logger.info(msg, *args, **kwargs)
 
-    def warning(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._root_logger.warning(msg, *args, **kwargs)
+    def warning(self, msg: Union[str, LazyMessage], *args: Any, **kwargs: Any) -> None:
+        if self.warning_enabled:
+            self._root_logger.warning(msg, *args, **kwargs)
 
-    def error(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._root_logger.error(msg, *args, **kwargs)
+    def error(self, msg: Union[str, LazyMessage], *args: Any, **kwargs: Any) -> None:
+        if self.error_enabled:
+            self._root_logger.error(msg, *args, **kwargs)
 
-    def critical(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._root_logger.critical(msg, *args, **kwargs)
\ No newline at end of file
+    def critical(self, msg: Union[str, LazyMessage], *args: Any, **kwargs: Any) -> None:
+        if self.critical_enabled:
+            self._root_logger.critical(msg, *args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,46 @@
+from typing import Any, Callable, Optional, Tuple
+
+
+class LazyMessage:
+    """
+    Отложенное сообщение лога.
+
+    Строка формируется только при первом вызове str(), то есть когда обработчик действительно
+    форматирует запись. Для отключенного уровня функция формирования не вызывается вовсе.
+
+    Пример::
+
+        logger.debug(LazyMessage("Состояние: {}".format, big_object))
+    """
+
+    __slots__ = ('_call', '_message')
+
+    def __init__(self, func: Callable[..., str], *args: Any, **kwargs: Any):
+        """
+        Инициализация LazyMessage.
+
+        Args:
+            func (Callable[..., str]): Функция, формирующая текст сообщения.
+            *args (Any): Позиционные аргументы функции.
+            **kwargs (Any): Именованные аргументы функции.
+        """
+        # Функция и аргументы хранятся одним кортежем, чтобы другой поток не увидел их частично очищенными
+        self._call: Optional[Tuple[Callable[..., str], tuple, dict]] = (func, args, kwargs)
+        self._message: Optional[str] = None
+
+    def __str__(self) -> str:
+        message = self._message
+        if message is None:
+            # Запись может форматироваться одновременно в нескольких потоках (например, поток-писатель
+            # и консольный обработчик): другой поток мог уже сохранить результат и очистить ссылки
+            call = self._call
+            if call is None:
+                return self._message
+            func, args, kwargs = call
+            message = str(func(*args, **kwargs))
+            self._message = message
+            self._call = None
+        return message
+
+    def __repr__(self) -> str:
+        return f"LazyMessage({str(self)!r})"
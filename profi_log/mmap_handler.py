@@ -0,0 +1,171 @@
+import logging
+import mmap
+import os
+import struct
+from typing import Optional
+
+MAGIC = b'PROFILOG'
+VERSION = 1
+# Заголовок сегмента: сигнатура, версия, резерв, размер сегмента, смещение конца записанных данных
+HEADER = struct.Struct('<8sIIQQ')
+HEADER_SIZE = HEADER.size
+OFFSET_POSITION = 24
+OFFSET = struct.Struct('<Q')
+
+
+def read_segment(filename: str, encoding: str = 'utf-8') -> str:
+    """
+    Читает записи из файла сегмента, в том числе после аварийного завершения процесса.
+
+    Args:
+        filename (str): Имя файла сегмента.
+        encoding (str): Кодировка записей. По умолчанию 'utf-8'.
+
+    Returns:
+        str: Текст записей до смещения, сохраненного в заголовке.
+
+    Raises:
+        ValueError: Если файл не является сегментом MmapFileHandler.
+    """
+    with open(filename, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"Файл '{filename}' не является сегментом лога")
+        magic, version, _, segment_size, offset = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Файл '{filename}' не является сегментом лога")
+        offset = min(offset, segment_size)
+        return f.read(offset - HEADER_SIZE).decode(encoding, 'replace')
+
+
+class MmapFileHandler(logging.Handler):
+    """
+    Файловый обработчик, записывающий записи в заранее выделенный сегмент, отображенный в память.
+
+    Запись - это копирование байтов в отображение и обновление смещения в заголовке, без системных вызовов.
+    Когда сегмент заполнен, он переименовывается как резервная копия и создается новый.
+    Смещение в заголовке позволяет восстановить записи после аварийного завершения процесса (см. read_segment).
+    """
+
+    def __init__(self, filename: str, maxBytes: int = 0, backupCount: int = 0, encoding: Optional[str] = None,
+                 segment_size: Optional[int] = None):
+        """
+        Инициализация MmapFileHandler.
+
+        Args:
+            filename (str): Имя файла сегмента.
+            maxBytes (int): Размер сегмента в байтах, если не указан segment_size.
+            backupCount (int): Количество резервных копий заполненных сегментов.
+            encoding (Optional[str]): Кодировка записей. По умолчанию 'utf-8'.
+            segment_size (Optional[int]): Размер сегмента в байтах. По умолчанию maxBytes или 64 МБ.
+        """
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.backupCount = backupCount
+        self.encoding = encoding or 'utf-8'
+        self.terminator = '\n'
+        self.segment_size = segment_size or maxBytes or 64 * 1024 * 1024
+        if self.segment_size <= HEADER_SIZE:
+            raise ValueError("Размер сегмента меньше размера заголовка")
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._offset = HEADER_SIZE
+        self._open_segment()
+
+    def _open_segment(self) -> None:
+        if os.path.exists(self.baseFilename) and not self._is_segment(self.baseFilename):
+            # Файл в другом формате (например, текстовый лог) не перезаписываем, а переносим в резервные копии
+            self._rotate_files()
+        self._file = open(self.baseFilename, 'a+b')
+        if os.fstat(self._file.fileno()).st_size != self.segment_size:
+            self._file.truncate(self.segment_size)
+            if hasattr(os, 'posix_fallocate'):
+                # Выделяем блоки заранее, чтобы запись в отображение не приводила к SIGBUS при нехватке места
+                os.posix_fallocate(self._file.fileno(), 0, self.segment_size)
+        self._mmap = mmap.mmap(self._file.fileno(), self.segment_size)
+        magic, version, _, _, offset = HEADER.unpack_from(self._mmap)
+        if magic == MAGIC and version == VERSION and HEADER_SIZE <= offset <= self.segment_size:
+            self._offset = offset
+        else:
+            self._offset = HEADER_SIZE
+            HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, 0, self.segment_size, self._offset)
+
+    @staticmethod
+    def _is_segment(filename: str) -> bool:
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        return len(header) == HEADER_SIZE and header[:len(MAGIC)] == MAGIC
+
+    def _close_segment(self) -> None:
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate_files(self) -> None:
+        if self.backupCount > 0:
+            for i in range(self.backupCount - 1, 0, -1):
+                source = f"{self.baseFilename}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.baseFilename}.{i + 1}")
+            os.replace(self.baseFilename, f"{self.baseFilename}.1")
+        else:
+            os.remove(self.baseFilename)
+
+    def doRollover(self) -> None:
+        """
+        Закрывает заполненный сегмент, переносит его в резервные копии и создает новый.
+        """
+        self._close_segment()
+        if os.path.exists(self.baseFilename):
+            self._rotate_files()
+        self._open_segment()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Копирует отформатированную запись в сегмент.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            if self._mmap is None:
+                self._open_segment()
+            capacity = self.segment_size - HEADER_SIZE
+            if len(data) > capacity:
+                data = data[:capacity]
+            if self._offset + len(data) > self.segment_size:
+                self.doRollover()
+            end = self._offset + len(data)
+            self._mmap[self._offset:end] = data
+            # Смещение обновляется после копирования данных: при сбое запись либо видна целиком, либо не видна
+            OFFSET.pack_into(self._mmap, OFFSET_POSITION, end)
+            self._offset = end
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """
+        Сбрасывает измененные страницы сегмента на диск.
+        """
+        self.acquire()
+        try:
+            if self._mmap is not None:
+                self._mmap.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """
+        Сбрасывает сегмент на диск и закрывает файл.
+        """
+        self.acquire()
+        try:
+            self._close_segment()
+            super().close()
+        finally:
+            self.release()
@@ -0,0 +1,124 @@
+import logging
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class MultiprocessFileHandler(logging.Handler):
+    """
+    Файловый обработчик с ротацией, безопасный при записи в один файл из нескольких процессов.
+
+    Файл открыт с O_APPEND, и каждая запись передается одним системным вызовом write, поэтому записи
+    разных процессов не перемешиваются. Ротацию выполняет один процесс под блокировкой flock файла
+    app.log.lock. Остальные процессы по той же блокировке видят, что файл уже заменен, и открывают новый.
+    """
+
+    def __init__(self, filename: str, maxBytes: int = 0, backupCount: int = 0, encoding: Optional[str] = None):
+        """
+        Инициализация MultiprocessFileHandler.
+
+        Args:
+            filename (str): Имя файла для логов.
+            maxBytes (int): Максимальный размер файла логов в байтах. 0 - без ротации.
+            backupCount (int): Количество резервных копий файлов логов. 0 - без ротации.
+            encoding (Optional[str]): Кодировка файла логов. По умолчанию 'utf-8'.
+
+        Raises:
+            ValueError: Если система не поддерживает блокировки fcntl.
+        """
+        if fcntl is None:
+            raise ValueError("Многопроцессная запись в файл поддерживается только в POSIX-системах")
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.lockFilename = self.baseFilename + '.lock'
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+        self.encoding = encoding or 'utf-8'
+        self.terminator = '\n'
+        self._fd: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self._pid = 0
+        self._open()
+
+    def _open(self) -> None:
+        if self._pid != os.getpid():
+            # После fork дескрипторы и блокировка flock общие с родителем: в дочернем процессе открываем свои
+            self._close_files()
+            self._pid = os.getpid()
+        elif self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _close_files(self) -> None:
+        for fd in (self._fd, self._lock_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = None
+        self._lock_fd = None
+
+    def _is_current(self) -> bool:
+        try:
+            path_stat = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return False
+        fd_stat = os.fstat(self._fd)
+        return (path_stat.st_dev, path_stat.st_ino) == (fd_stat.st_dev, fd_stat.st_ino)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Дописывает запись в конец файла одним вызовом write, при необходимости выполняя ротацию.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            if self._fd is None or self._pid != os.getpid():
+                self._open()
+            stat = os.fstat(self._fd)
+            if stat.st_nlink == 0:
+                # Файл удален при ротации другим процессом: запись в него была бы потеряна
+                self._open()
+            elif (self.maxBytes > 0 and self.backupCount > 0 and stat.st_size
+                  and stat.st_size + len(data) > self.maxBytes):
+                self.doRollover()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self) -> None:
+        """
+        Выполняет ротацию под межпроцессной блокировкой.
+
+        Если другой процесс уже заменил файл, ротация не повторяется, а открывается новый файл.
+        """
+        if self._lock_fd is None:
+            self._lock_fd = os.open(self.lockFilename, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            if self._is_current():
+                for i in range(self.backupCount - 1, 0, -1):
+                    source = f"{self.baseFilename}.{i}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{self.baseFilename}.{i + 1}")
+                os.replace(self.baseFilename, f"{self.baseFilename}.1")
+            self._open()
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """
+        Закрывает файл и файл блокировки.
+        """
+        self.acquire()
+        try:
+            self._close_files()
+            super().close()
+        finally:
+            self.release()
@@ -0,0 +1,126 @@
+import threading
+from typing import Dict, List
+
+# Количество бит точности внутри одного порядка: 2 ** 4 = 16 линейных поддиапазонов,
+# относительная погрешность значения не превышает 1/16 (~6%).
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+EXACT_LIMIT = SUB_BUCKETS * 2
+MAX_BUCKETS = SUB_BUCKETS * 64
+
+
+def bucket_index(value: int) -> int:
+    """
+    Возвращает номер логарифмического интервала для значения.
+
+    Args:
+        value (int): Неотрицательное значение (например, время в наносекундах).
+
+    Returns:
+        int: Номер интервала гистограммы.
+    """
+    if value < EXACT_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_upper_bound(index: int) -> int:
+    """
+    Возвращает наибольшее значение, попадающее в интервал с указанным номером.
+
+    Args:
+        index (int): Номер интервала гистограммы.
+
+    Returns:
+        int: Верхняя граница интервала.
+    """
+    if index < EXACT_LIMIT:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    lower = (SUB_BUCKETS + index % SUB_BUCKETS) << shift
+    return lower + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Потоковая гистограмма задержек с логарифмическими интервалами (в стиле HDR Histogram).
+
+    Запись значения - это вычисление номера интервала и увеличение счетчика, память не растет
+    с количеством записей.
+    """
+
+    def __init__(self, name: str):
+        """
+        Инициализация LatencyHistogram.
+
+        Args:
+            name (str): Имя функции, для которой собирается статистика.
+        """
+        self.name = name
+        self._counts: List[int] = [0] * MAX_BUCKETS
+        self._count = 0
+        self._max = 0
+        self._lock = threading.Lock()
+
+    def record(self, value: int) -> None:
+        """
+        Добавляет значение в гистограмму.
+
+        Args:
+            value (int): Время выполнения в наносекундах.
+        """
+        index = bucket_index(value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    def percentile(self, percent: float) -> int:
+        """
+        Возвращает значение указанного процентиля.
+
+        Args:
+            percent (float): Процентиль от 0 до 100.
+
+        Returns:
+            int: Верхняя граница интервала, в который попадает процентиль. 0, если записей нет.
+        """
+        with self._lock:
+            return self._percentile(percent)
+
+    def _percentile(self, percent: float) -> int:
+        if not self._count:
+            return 0
+        threshold = max(1, int(self._count * percent / 100 + 0.5))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= threshold:
+                return min(bucket_upper_bound(index), self._max)
+        return self._max
+
+    def snapshot(self, reset: bool = False) -> Dict[str, int]:
+        """
+        Возвращает сводную статистику гистограммы.
+
+        Args:
+            reset (bool): Очистить гистограмму после получения статистики. По умолчанию False.
+
+        Returns:
+            Dict[str, int]: Количество вызовов и p50/p95/p99/max в наносекундах.
+        """
+        with self._lock:
+            stats = {
+                'count': self._count,
+                'p50': self._percentile(50),
+                'p95': self._percentile(95),
+                'p99': self._percentile(99),
+                'max': self._max,
+            }
+            if reset:
+                self._counts = [0] * MAX_BUCKETS
+                self._count = 0
+                self._max = 0
+        return stats
@@ -0,0 +1,141 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+# Атрибут записи, освобождающий ее от ограничения частоты (например, для сводок самого логгера)
+RATE_LIMIT_EXEMPT = 'rate_limit_exempt'
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты по алгоритму token bucket.
+
+    Счетчики обновляются без блокировок: при одновременных вызовах из нескольких потоков
+    лимит и количество отброшенных записей могут соблюдаться приблизительно.
+    """
+
+    __slots__ = ('rate', 'burst', 'dropped', '_tokens', '_updated')
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Инициализация TokenBucket.
+
+        Args:
+            rate (float): Средняя допустимая частота в секунду.
+            burst (Optional[float]): Максимальное количество событий подряд. По умолчанию равно rate.
+
+        Raises:
+            ValueError: Если параметры некорректны.
+        """
+        if rate <= 0:
+            raise ValueError("rate должен быть больше 0")
+        burst = rate if burst is None else burst
+        if burst < 1:
+            raise ValueError("burst должен быть не меньше 1")
+        self.rate = rate
+        self.burst = burst
+        self.dropped = 0
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+
+    def consume(self, now: float) -> bool:
+        """
+        Расходует один токен.
+
+        Args:
+            now (float): Текущее время в секундах.
+
+        Returns:
+            bool: True, если событие укладывается в лимит.
+        """
+        tokens = self._tokens
+        if self._updated is not None and now > self._updated:
+            tokens = min(self.burst, tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if tokens < 1.0:
+            self._tokens = tokens
+            self.dropped += 1
+            return False
+        self._tokens = tokens - 1.0
+        return True
+
+    def take_dropped(self) -> int:
+        """
+        Возвращает количество отброшенных событий и обнуляет счетчик.
+
+        Returns:
+            int: Количество событий сверх лимита с последнего вызова.
+        """
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Фильтр логгера, ограничивающий частоту записей каждого уровня.
+
+    Время берется из уже созданной записи (record.created), поэтому проверка не обращается к часам.
+    Записи с атрибутом RATE_LIMIT_EXEMPT пропускаются без учета в лимите.
+    """
+
+    def __init__(self, name: str = ''):
+        """
+        Инициализация RateLimitFilter.
+
+        Args:
+            name (str): Имя логгера для сводки отброшенных записей.
+        """
+        super().__init__()
+        self.logger_name = name
+        self._buckets: Dict[int, TokenBucket] = {}
+
+    def set_limit(self, level: int, rate: float, burst: Optional[float] = None) -> None:
+        """
+        Задает лимит для уровня.
+
+        Args:
+            level (int): Уровень логирования.
+            rate (float): Максимальная средняя частота записей в секунду.
+            burst (Optional[float]): Максимальное количество записей подряд. По умолчанию равно rate.
+        """
+        # Словарь заменяется целиком, чтобы не изменять его во время чтения в filter
+        buckets = dict(self._buckets)
+        buckets[level] = TokenBucket(rate, burst)
+        self._buckets = buckets
+
+    def remove_limit(self, level: int) -> None:
+        """
+        Снимает лимит для уровня.
+
+        Args:
+            level (int): Уровень логирования.
+        """
+        buckets = dict(self._buckets)
+        buckets.pop(level, None)
+        self._buckets = buckets
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Проверяет, укладывается ли запись в лимит своего уровня.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            bool: True, если запись нужно вывести.
+        """
+        bucket = self._buckets.get(record.levelno)
+        return bucket is None or RATE_LIMIT_EXEMPT in record.__dict__ or bucket.consume(record.created)
+
+    def take_dropped(self) -> List[Tuple[int, int]]:
+        """
+        Возвращает количество отброшенных записей по уровням и обнуляет счетчики.
+
+        Returns:
+            List[Tuple[int, int]]: Пары (уровень, количество) для уровней с отброшенными записями.
+        """
+        result = []
+        for level, bucket in sorted(self._buckets.items()):
+            dropped = bucket.take_dropped()
+            if dropped:
+                result.append((level, dropped))
+        return result
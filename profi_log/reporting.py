@@ -0,0 +1,57 @@
+import threading
+import traceback
+from typing import Callable, List, Optional
+
+
+class PeriodicReporter:
+    """
+    Фоновый поток, который периодически вызывает зарегистрированные функции отчетов
+    (сводки пропущенных вызовов, статистика и т.п.).
+    """
+
+    def __init__(self, interval: float):
+        """
+        Инициализация PeriodicReporter.
+
+        Args:
+            interval (float): Интервал между отчетами в секундах. 0 - только отчеты по запросу.
+        """
+        self.interval = interval
+        self._callbacks: List[Callable[[], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, callback: Callable[[], None]) -> None:
+        """
+        Регистрирует функцию отчета и при необходимости запускает фоновый поток.
+
+        Args:
+            callback (Callable[[], None]): Функция, формирующая отчет.
+        """
+        self._callbacks.append(callback)
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name='profi_log-reporter', daemon=True)
+            self._thread.start()
+
+    def report(self) -> None:
+        """
+        Немедленно вызывает все зарегистрированные функции отчетов.
+        """
+        for callback in list(self._callbacks):
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.report()
+
+    def stop(self) -> None:
+        """
+        Останавливает фоновый поток.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
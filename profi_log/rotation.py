@@ -0,0 +1,328 @@
+import calendar
+import glob
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from typing import BinaryIO, List, Optional, Tuple
+from .handlers import write_all
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+# Суффикс файла, закрытого при ротации и ожидающего сжатия
+PENDING_SUFFIX = '.rotated-'
+COPY_CHUNK = 1024 * 1024
+
+_STOP = object()
+
+
+class CompressedRotatingFileHandler(RotatingFileHandler):
+    """
+    Файловый обработчик с ротацией, сжимающий резервные копии в фоновом потоке.
+
+    При ротации поток, записывающий лог, только переименовывает заполненный файл. Сдвиг резервных копий,
+    сжатие (app.log.1.gz или app.log.1.zst) и удаление старых копий выполняет фоновый поток.
+    Копии хранятся с ограничением по количеству и по суммарному размеру на диске.
+    """
+
+    def __init__(self, filename: str, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = None, delay: bool = False, compression: str = 'gzip',
+                 compress_level: Optional[int] = None, max_total_bytes: int = 0):
+        """
+        Инициализация CompressedRotatingFileHandler.
+
+        Args:
+            filename (str): Имя файла для логов.
+            mode (str): Режим открытия файла.
+            maxBytes (int): Максимальный размер файла логов в байтах. 0 - без ротации.
+            backupCount (int): Максимальное количество сжатых резервных копий. 0 - без ограничения по количеству.
+            encoding (Optional[str]): Кодировка файла логов.
+            delay (bool): Открывать файл только при первой записи.
+            compression (str): Алгоритм сжатия: 'gzip' или 'zstd' (требуется пакет zstandard).
+                По умолчанию 'gzip'.
+            compress_level (Optional[int]): Уровень сжатия. По умолчанию 6 для gzip и 3 для zstd.
+            max_total_bytes (int): Максимальный суммарный размер сжатых резервных копий в байтах.
+                Самые старые копии сверх лимита удаляются. 0 - без ограничения. По умолчанию 0.
+
+        Raises:
+            ValueError: Если указан неизвестный алгоритм сжатия или zstandard не установлен.
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Неизвестный алгоритм сжатия: '{compression}'")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("Для сжатия zstd установите пакет zstandard: pip install profi_log[zstd]")
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
+        self.compression = compression
+        self.compress_level = compress_level
+        self.max_total_bytes = max_total_bytes
+        self.suffix = COMPRESSIONS[compression]
+        self._backup_pattern = re.compile(re.escape(os.path.basename(self.baseFilename)) + r'\.(\d+)'
+                                          + re.escape(self.suffix) + '$')
+        self._queue: queue.Queue = queue.Queue()
+        # Файлы, оставшиеся несжатыми после аварийного завершения процесса, сжимаются первыми
+        pending = self._pending_files()
+        self._pending_seq = pending[-1][0] if pending else 0
+        for _, pending_name in pending:
+            self._queue.put(pending_name)
+        self._thread = threading.Thread(target=self._run, name='profi_log-compressor', daemon=True)
+        self._thread.start()
+
+    def _pending_files(self) -> List[Tuple[int, str]]:
+        files = []
+        for name in glob.glob(glob.escape(self.baseFilename + PENDING_SUFFIX) + '*'):
+            seq = name[len(self.baseFilename + PENDING_SUFFIX):]
+            if seq.isdigit():
+                files.append((int(seq), name))
+        return sorted(files)
+
+    def doRollover(self) -> None:
+        """
+        Закрывает текущий файл, переименовывает его и передает фоновому потоку для сжатия.
+        """
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename):
+            self._pending_seq += 1
+            pending_name = f"{self.baseFilename}{PENDING_SUFFIX}{self._pending_seq}"
+            os.replace(self.baseFilename, pending_name)
+            self._queue.put(pending_name)
+        if not self.delay:
+            self.stream = self._open()
+
+    def _run(self) -> None:
+        while True:
+            pending_name = self._queue.get()
+            try:
+                if pending_name is _STOP:
+                    return
+                self._shift_backups()
+                self._compress(pending_name, self.backup_name(1))
+                os.remove(pending_name)
+                self._enforce_budget()
+            except Exception:
+                # Ошибка сжатия не должна останавливать поток: несжатый файл останется на диске
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    def backup_name(self, index: int) -> str:
+        """
+        Возвращает имя сжатой резервной копии.
+
+        Args:
+            index (int): Номер копии, 1 - самая новая.
+
+        Returns:
+            str: Имя файла, например app.log.1.gz.
+        """
+        return f"{self.baseFilename}.{index}{self.suffix}"
+
+    def _backups(self) -> List[int]:
+        directory = os.path.dirname(self.baseFilename)
+        indices = []
+        for name in os.listdir(directory):
+            match = self._backup_pattern.match(name)
+            if match:
+                indices.append(int(match.group(1)))
+        return sorted(indices)
+
+    def _shift_backups(self) -> None:
+        for index in reversed(self._backups()):
+            if self.backupCount > 0 and index >= self.backupCount:
+                os.remove(self.backup_name(index))
+            else:
+                os.replace(self.backup_name(index), self.backup_name(index + 1))
+
+    def _compress(self, source: str, target: str) -> None:
+        temp_name = target + '.tmp'
+        with open(source, 'rb') as f_in, open(temp_name, 'wb') as f_out:
+            if self.compression == 'zstd':
+                level = 3 if self.compress_level is None else self.compress_level
+                zstandard.ZstdCompressor(level=level).copy_stream(f_in, f_out, read_size=COPY_CHUNK)
+            else:
+                level = 6 if self.compress_level is None else self.compress_level
+                with gzip.GzipFile(os.path.basename(self.baseFilename), 'wb', level, f_out) as gz_out:
+                    shutil.copyfileobj(f_in, gz_out, COPY_CHUNK)
+        # Копия появляется под итоговым именем только целиком
+        os.replace(temp_name, target)
+
+    def _enforce_budget(self) -> None:
+        if self.max_total_bytes <= 0:
+            return
+        total = 0
+        for index in self._backups():
+            name = self.backup_name(index)
+            total += os.path.getsize(name)
+            if total > self.max_total_bytes:
+                os.remove(name)
+
+    def wait_compressed(self) -> None:
+        """
+        Ожидает завершения сжатия всех резервных копий, переданных фоновому потоку.
+        """
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Закрывает файл и дожидается сжатия оставшихся резервных копий.
+        """
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._queue.put(_STOP)
+            self._thread.join()
+        super().close()
+
+
+ROTATION_INTERVALS = {'hourly': '%Y-%m-%d_%H', 'daily': '%Y-%m-%d'}
+
+
+class HybridRotatingFileHandler(RotatingFileHandler):
+    """
+    Файловый обработчик с ротацией по времени (каждый час или сутки) и, дополнительно, по размеру.
+
+    Закрытые файлы получают имя с датой периода: app.log.2024-05-01 или app.log.2024-05-01_13,
+    при ротации по размеру внутри периода добавляется номер: app.log.2024-05-01.1.
+    Для проверки ротации время записи сравнивается с заранее вычисленной границей периода,
+    а размер файла ведется счетчиком записанных байтов, без tell() и stat() на каждую запись.
+    """
+
+    def __init__(self, filename: str, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = None, delay: bool = False, when: str = 'daily', utc: bool = False):
+        """
+        Инициализация HybridRotatingFileHandler.
+
+        Args:
+            filename (str): Имя файла для логов.
+            mode (str): Режим открытия файла. Используется только для совместимости с RotatingFileHandler.
+            maxBytes (int): Максимальный размер файла логов в байтах. 0 - только ротация по времени.
+            backupCount (int): Количество хранимых закрытых файлов. 0 - без ограничения.
+            encoding (Optional[str]): Кодировка файла логов. По умолчанию 'utf-8'.
+            delay (bool): Открывать файл только при первой записи.
+            when (str): Период ротации: 'hourly' или 'daily'. По умолчанию 'daily'.
+            utc (bool): Определять границы периодов по UTC, а не по локальному времени. По умолчанию False.
+
+        Raises:
+            ValueError: Если указан неизвестный период ротации.
+        """
+        if when not in ROTATION_INTERVALS:
+            raise ValueError(f"Неизвестный период ротации: '{when}'")
+        self.when = when
+        self.utc = utc
+        self.stamp_format = ROTATION_INTERVALS[when]
+        self._file_size = 0
+        super().__init__(filename, mode, maxBytes, backupCount, encoding or 'utf-8', delay)
+        self._segment_pattern = re.compile(re.escape(os.path.basename(self.baseFilename))
+                                           + r'\.(\d{4}-\d{2}-\d{2}(?:_\d{2})?)(?:\.(\d+))?$')
+        # Период существующего файла определяется по времени его последнего изменения
+        if os.path.exists(self.baseFilename):
+            self._start_period(os.stat(self.baseFilename).st_mtime)
+        else:
+            self._start_period(time.time())
+
+    def _start_period(self, timestamp: float) -> None:
+        tm = time.gmtime(timestamp) if self.utc else time.localtime(timestamp)
+        if self.when == 'hourly':
+            end = (tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour + 1, 0, 0, 0, 0, -1)
+        else:
+            end = (tm.tm_year, tm.tm_mon, tm.tm_mday + 1, 0, 0, 0, 0, 0, -1)
+        # timegm и mktime нормализуют переполнение часа и дня, mktime также учитывает переход на летнее время
+        to_timestamp = calendar.timegm if self.utc else time.mktime
+        self._period_stamp = time.strftime(self.stamp_format, tm)
+        self.rolloverAt = to_timestamp(end)
+
+    def _open(self) -> BinaryIO:
+        stream = open(self.baseFilename, 'ab', buffering=0)
+        self._file_size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """
+        Проверяет, наступил ли следующий период ротации.
+
+        Размер файла проверяется в emit, где уже известна длина закодированной записи.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            bool: True, если время записи не раньше границы текущего периода.
+        """
+        return record.created >= self.rolloverAt
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Записывает запись в файл, при необходимости выполняя ротацию.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+        """
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            if self.stream is None:
+                self.stream = self._open()
+            if record.created >= self.rolloverAt:
+                self.doRollover()
+                self._start_period(record.created)
+            elif self.maxBytes > 0 and self._file_size and self._file_size + len(data) > self.maxBytes:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            write_all(self.stream, data)
+            self._file_size += len(data)
+        except Exception:
+            self.handleError(record)
+
+    def segment_name(self) -> str:
+        """
+        Возвращает свободное имя для закрываемого файла текущего периода.
+
+        Returns:
+            str: Имя вида app.log.2024-05-01 или app.log.2024-05-01.N, если оно уже занято.
+        """
+        name = f"{self.baseFilename}.{self._period_stamp}"
+        index = 0
+        while os.path.exists(name):
+            index += 1
+            name = f"{self.baseFilename}.{self._period_stamp}.{index}"
+        return name
+
+    def doRollover(self) -> None:
+        """
+        Закрывает текущий файл, переименовывает его по дате периода и удаляет файлы сверх backupCount.
+        """
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            os.replace(self.baseFilename, self.segment_name())
+            if self.backupCount > 0:
+                for name in self.segments()[:-self.backupCount]:
+                    os.remove(name)
+        if not self.delay:
+            self.stream = self._open()
+
+    def segments(self) -> List[str]:
+        """
+        Возвращает закрытые файлы лога от старых к новым.
+
+        Returns:
+            List[str]: Полные имена файлов.
+        """
+        directory = os.path.dirname(self.baseFilename)
+        found = []
+        for name in os.listdir(directory):
+            match = self._segment_pattern.match(name)
+            if match:
+                found.append((match.group(1), int(match.group(2) or 0), os.path.join(directory, name)))
+        return [name for _, _, name in sorted(found)]
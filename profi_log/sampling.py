@@ -0,0 +1,78 @@
+import random
+import time
+from typing import Optional
+
+
+class CallSampler:
+    """
+    Решает, нужно ли логировать очередной вызов функции, и считает пропущенные вызовы.
+
+    Счетчики обновляются без блокировок: при одновременных вызовах из нескольких потоков
+    количество пропущенных вызовов может быть приблизительным.
+    """
+
+    __slots__ = ('name', 'every', 'rate', 'max_per_second', 'suppressed', '_calls', '_window', '_window_count')
+
+    def __init__(self, name: str, every: int = 1, rate: float = 1.0, max_per_second: Optional[int] = None):
+        """
+        Инициализация CallSampler.
+
+        Args:
+            name (str): Имя функции для сводки пропущенных вызовов.
+            every (int): Логировать каждый N-й вызов. По умолчанию 1 (каждый вызов).
+            rate (float): Вероятность логирования вызова от 0 до 1. По умолчанию 1.0.
+            max_per_second (Optional[int]): Максимальное количество логируемых вызовов в секунду.
+
+        Raises:
+            ValueError: Если параметры сэмплирования некорректны.
+        """
+        if every < 1:
+            raise ValueError("every должен быть не меньше 1")
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("rate должен быть в диапазоне от 0 до 1")
+        if max_per_second is not None and max_per_second < 0:
+            raise ValueError("max_per_second не может быть отрицательным")
+        self.name = name
+        self.every = every
+        self.rate = rate
+        self.max_per_second = max_per_second
+        self.suppressed = 0
+        self._calls = 0
+        self._window = 0
+        self._window_count = 0
+
+    def should_log(self) -> bool:
+        """
+        Проверяет, нужно ли логировать текущий вызов.
+
+        Returns:
+            bool: True, если вызов нужно логировать.
+        """
+        self._calls += 1
+        if self.every > 1 and self._calls % self.every:
+            self.suppressed += 1
+            return False
+        if self.rate < 1.0 and random.random() >= self.rate:
+            self.suppressed += 1
+            return False
+        if self.max_per_second is not None:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window = window
+                self._window_count = 0
+            if self._window_count >= self.max_per_second:
+                self.suppressed += 1
+                return False
+            self._window_count += 1
+        return True
+
+    def take_suppressed(self) -> int:
+        """
+        Возвращает количество пропущенных вызовов с момента предыдущего вызова и обнуляет счетчик.
+
+        Returns:
+            int: Количество пропущенных вызовов.
+        """
+        suppressed = self.suppressed
+        self.suppressed -= suppressed
+        return suppressed
@@ -0,0 +1,132 @@
+import contextvars
+import logging
+from typing import FrozenSet, List, Optional, Tuple
+
+# Фильтры, временный уровень которых установлен в текущем потоке или задаче asyncio
+_active_filters: 'contextvars.ContextVar[Tuple[ScopedLevelFilter, ...]]' = \
+    contextvars.ContextVar('profi_log_scoped_levels', default=())
+
+
+def _context_level(record: logging.LogRecord, filters: Tuple['ScopedLevelFilter', ...]) -> Optional[int]:
+    # Временный уровень ближайшего к логгеру записи целевого логгера среди областей текущего контекста
+    closest = None
+    for level_filter in filters:
+        if record.name in level_filter.names and (closest is None or level_filter.depth > closest.depth):
+            closest = level_filter
+    return None if closest is None else closest._level.get()
+
+
+def has_scoped_level(record: logging.LogRecord) -> bool:
+    """
+    Проверяет, действует ли в текущем потоке или задаче временный уровень для логгера записи.
+
+    Args:
+        record (logging.LogRecord): Запись лога.
+
+    Returns:
+        bool: True, если запись создана внутри temporary_log_level, затрагивающего ее логгер.
+    """
+    filters = _active_filters.get()
+    return bool(filters) and any(record.name in level_filter.names for level_filter in filters)
+
+
+class ScopedLevelFilter(logging.Filter):
+    """
+    Фильтр логгера, применяющий временный уровень только в текущем потоке или задаче asyncio.
+
+    На время действия временных уровней уровень логгера понижается до наименьшего из них,
+    а фильтр отбрасывает записи потоков и задач без временного уровня, не проходящие прежний
+    уровень логгера. Вне областей действия проверка в фильтре - одно чтение ContextVar. Если в контексте
+    действуют временные уровни нескольких логгеров (например, основного и дочернего), решает уровень
+    ближайшего к логгеру записи.
+
+    Задачи asyncio, созданные внутри области действия, получают копию контекста и наследуют временный уровень.
+    """
+
+    def __init__(self, logger: logging.Logger, effective_level: int):
+        """
+        Инициализация ScopedLevelFilter.
+
+        Args:
+            logger (logging.Logger): Логгер, уровень которого изменяется временно.
+            effective_level (int): Действующий уровень логгера без учета временных уровней.
+        """
+        super().__init__()
+        self.logger = logger
+        self.base_level = logger.level
+        self.effective_level = effective_level
+        self.depth = 0 if logger is logging.getLogger() else logger.name.count('.') + 1
+        # Временные уровни всех активных областей действия, в том числе из других потоков
+        self.active: List[int] = []
+        # Логгеры, к которым подключен фильтр: сам логгер и наследующие его уровень дочерние логгеры
+        self.loggers: List[logging.Logger] = []
+        self.names: FrozenSet[str] = frozenset()
+        self._level: contextvars.ContextVar[int] = contextvars.ContextVar(f'profi_log_level_{id(self)}')
+
+    def attach(self, loggers: List[logging.Logger]) -> None:
+        """
+        Подключает фильтр к логгерам.
+
+        Args:
+            loggers (List[logging.Logger]): Логгер и наследующие его уровень дочерние логгеры.
+        """
+        self.loggers = loggers
+        self.names = frozenset(logger.name for logger in loggers)
+        for logger in loggers:
+            logger.addFilter(self)
+
+    def detach(self) -> None:
+        """
+        Отключает фильтр от логгеров.
+        """
+        for logger in self.loggers:
+            logger.removeFilter(self)
+
+    def set(self, level: int) -> Tuple[contextvars.Token, contextvars.Token]:
+        """
+        Устанавливает временный уровень для текущего потока или задачи.
+
+        Args:
+            level (int): Временный уровень логирования.
+
+        Returns:
+            Tuple[contextvars.Token, contextvars.Token]: Маркеры для восстановления прежнего уровня через reset.
+        """
+        return self._level.set(level), _active_filters.set(_active_filters.get() + (self,))
+
+    def reset(self, tokens: Tuple[contextvars.Token, contextvars.Token]) -> None:
+        """
+        Восстанавливает уровень, действовавший до вызова set. Вызовы reset должны идти в порядке,
+        обратном вызовам set.
+
+        Args:
+            tokens (Tuple[contextvars.Token, contextvars.Token]): Маркеры, полученные от set.
+        """
+        level_token, filters_token = tokens
+        _active_filters.reset(filters_token)
+        self._level.reset(level_token)
+
+    def logger_level(self) -> int:
+        """
+        Возвращает уровень логгера, при котором создаются записи всех активных временных уровней.
+
+        Returns:
+            int: Наименьший из прежнего уровня и временных уровней.
+        """
+        return min(self.effective_level, *self.active)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Проверяет запись по временному уровню текущего контекста или по прежнему уровню логгера.
+
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            bool: True, если запись нужно вывести.
+        """
+        filters = _active_filters.get()
+        if not filters:
+            return record.levelno >= self.effective_level
+        level = _context_level(record, filters)
+        return record.levelno >= (self.effective_level if level is None else level)
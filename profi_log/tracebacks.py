@@ -0,0 +1,254 @@
+import hashlib
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from types import TracebackType
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+CAUSE_MESSAGE = "\nThe above exception was the direct cause of the following exception:\n\n"
+CONTEXT_MESSAGE = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+# Каталоги стандартной библиотеки и установленных пакетов
+LIBRARY_PATHS = tuple(sorted({
+    os.path.join(os.path.normcase(os.path.abspath(path)), '')
+    for key in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+    for path in [sysconfig.get_paths().get(key)] if path
+}))
+
+
+def is_library_file(filename: str) -> bool:
+    """
+    Проверяет, относится ли файл к стандартной библиотеке или установленному пакету.
+
+    Args:
+        filename (str): Имя файла из кадра трассировки.
+
+    Returns:
+        bool: True для файлов библиотек и встроенных модулей (например, '<frozen importlib._bootstrap>').
+    """
+    if filename.startswith('<'):
+        return filename.startswith('<frozen ')
+    return os.path.normcase(os.path.abspath(filename)).startswith(LIBRARY_PATHS)
+
+
+class TracebackRenderer:
+    """
+    Форматирует трассировки исключений с кэшированием.
+
+    Стек вызовов форматируется один раз для каждого сочетания типа исключения и мест вызова
+    (объект кода и инструкция каждого кадра) и хранится в ограниченном LRU-кэше.
+    При повторе заново форматируется только строка с сообщением исключения.
+    """
+
+    def __init__(self, max_entries: int = 256, max_frames: Optional[int] = None, strip_library_frames: bool = False):
+        """
+        Инициализация TracebackRenderer.
+
+        Args:
+            max_entries (int): Максимальное количество трассировок в кэше. По умолчанию 256.
+            max_frames (Optional[int]): Максимальное количество выводимых кадров, ближайших к месту исключения.
+                По умолчанию без ограничения.
+            strip_library_frames (bool): Не выводить кадры стандартной библиотеки и установленных пакетов.
+                По умолчанию False.
+        """
+        self.max_entries = max_entries
+        self.max_frames = max_frames
+        self.strip_library_frames = strip_library_frames
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[tuple, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],
+               tb: Optional[TracebackType]) -> str:
+        """
+        Форматирует исключение вместе с цепочкой причин так же, как traceback.format_exception.
+
+        Args:
+            exc_type (Optional[Type[BaseException]]): Тип исключения.
+            exc_value (Optional[BaseException]): Исключение.
+            tb (Optional[TracebackType]): Трассировка.
+
+        Returns:
+            str: Текст трассировки.
+        """
+        if exc_value is None or (sys.version_info >= (3, 11) and isinstance(exc_value, BaseExceptionGroup)):
+            # Группы исключений выводятся деревом, их форматирует стандартная библиотека
+            return ''.join(traceback.format_exception(exc_type, exc_value, tb))
+        parts: List[str] = []
+        self._render(exc_type or type(exc_value), exc_value, tb, parts, set())
+        return ''.join(parts)
+
+    def _render(self, exc_type: Type[BaseException], exc_value: BaseException, tb: Optional[TracebackType],
+                parts: List[str], seen: Set[int]) -> None:
+        seen.add(id(exc_value))
+        cause = exc_value.__cause__
+        context = exc_value.__context__
+        if cause is not None and id(cause) not in seen:
+            self._render(type(cause), cause, cause.__traceback__, parts, seen)
+            parts.append(CAUSE_MESSAGE)
+        elif context is not None and not exc_value.__suppress_context__ and id(context) not in seen:
+            self._render(type(context), context, context.__traceback__, parts, seen)
+            parts.append(CONTEXT_MESSAGE)
+        if tb is not None:
+            parts.append(self._stack(exc_type, tb))
+        parts.extend(traceback.format_exception_only(exc_type, exc_value))
+
+    def _stack(self, exc_type: Type[BaseException], tb: TracebackType) -> str:
+        key: List[object] = [exc_type]
+        current: Optional[TracebackType] = tb
+        while current is not None:
+            key.append((current.tb_frame.f_code, current.tb_lasti))
+            current = current.tb_next
+        cache_key = tuple(key)
+        with self._lock:
+            text = self._cache.get(cache_key)
+            if text is not None:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return text
+            self.misses += 1
+        text = self._format_stack(tb)
+        with self._lock:
+            self._cache[cache_key] = text
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return text
+
+    def _format_stack(self, tb: TracebackType) -> str:
+        lines = ["Traceback (most recent call last):\n"]
+        if self.max_frames is None:
+            frames = traceback.extract_tb(tb)
+        else:
+            total = 0
+            current: Optional[TracebackType] = tb
+            while current is not None:
+                total += 1
+                current = current.tb_next
+            # Отрицательный limit оставляет кадры, ближайшие к месту исключения
+            frames = traceback.extract_tb(tb, limit=-self.max_frames) if self.max_frames > 0 else []
+            if total > len(frames):
+                lines.append(f"  [... пропущено кадров: {total - len(frames)}]\n")
+
+        # Кадры между пропущенными кадрами библиотек форматируются одним участком,
+        # чтобы сохранить свертку повторяющихся кадров рекурсии
+        chunk: List[traceback.FrameSummary] = []
+        stripped = 0
+        for frame in frames:
+            if self.strip_library_frames and is_library_file(frame.filename):
+                if chunk:
+                    lines.extend(traceback.StackSummary.from_list(chunk).format())
+                    chunk = []
+                stripped += 1
+                continue
+            if stripped:
+                lines.append(f"  [... пропущено кадров библиотек: {stripped}]\n")
+                stripped = 0
+            chunk.append(frame)
+        lines.extend(traceback.StackSummary.from_list(chunk).format())
+        if stripped:
+            lines.append(f"  [... пропущено кадров библиотек: {stripped}]\n")
+        return ''.join(lines)
+
+    def clear(self) -> None:
+        """
+        Очищает кэш трассировок.
+        """
+        with self._lock:
+            self._cache.clear()
+
+
+def exception_fingerprint(exc_type: Type[BaseException], tb: Optional[TracebackType]) -> Tuple[str, str]:
+    """
+    Вычисляет отпечаток исключения по его типу и всем кадрам трассировки.
+
+    Args:
+        exc_type (Type[BaseException]): Тип исключения.
+        tb (Optional[TracebackType]): Трассировка.
+
+    Returns:
+        Tuple[str, str]: Отпечаток и описание вида "ValueError (app.py:42)" с местом возникновения исключения.
+    """
+    parts = [f"{exc_type.__module__}.{exc_type.__qualname__}"]
+    location = ''
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        parts.append(f"{code.co_filename}:{code.co_name}:{tb.tb_lasti}")
+        location = f"{os.path.basename(code.co_filename)}:{tb.tb_lineno}"
+        tb = tb.tb_next
+    fingerprint = hashlib.blake2b('\0'.join(parts).encode('utf-8', 'replace'), digest_size=6).hexdigest()
+    description = f"{exc_type.__qualname__} ({location})" if location else exc_type.__qualname__
+    return fingerprint, description
+
+
+class ExceptionAggregator:
+    """
+    Счетчик повторов исключений по отпечаткам.
+
+    Первое появление отпечатка в окне выводится полностью, повторы в том же окне - одной строкой.
+    Таблица ограничена по размеру с вытеснением давно не встречавшихся отпечатков.
+    """
+
+    def __init__(self, window: float, max_fingerprints: int = 1000):
+        """
+        Инициализация ExceptionAggregator.
+
+        Args:
+            window (float): Окно агрегации в секундах.
+            max_fingerprints (int): Максимальное количество отпечатков в таблице. По умолчанию 1000.
+        """
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        # отпечаток -> [начало окна, номер появления в окне]
+        self._windows: 'OrderedDict[str, list]' = OrderedDict()
+        # отпечаток -> [количество с последней сводки, описание]
+        self._counts: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, fingerprint: str, description: str) -> int:
+        """
+        Регистрирует появление исключения.
+
+        Args:
+            fingerprint (str): Отпечаток исключения.
+            description (str): Описание для сводки.
+
+        Returns:
+            int: Номер появления в текущем окне: 1 - первое появление, которое нужно вывести полностью.
+        """
+        now = time.monotonic()
+        with self._lock:
+            counter = self._counts.get(fingerprint)
+            if counter is not None:
+                counter[0] += 1
+            elif len(self._counts) < self.max_fingerprints:
+                self._counts[fingerprint] = [1, description]
+            entry = self._windows.get(fingerprint)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                self._windows.move_to_end(fingerprint)
+                return entry[1]
+            self._windows[fingerprint] = [now, 1]
+            self._windows.move_to_end(fingerprint)
+            while len(self._windows) > self.max_fingerprints:
+                self._windows.popitem(last=False)
+            return 1
+
+    def take_top(self, limit: int) -> List[Tuple[str, str, int]]:
+        """
+        Возвращает самые частые исключения с момента последнего вызова и обнуляет счетчики.
+
+        Args:
+            limit (int): Максимальное количество отпечатков.
+
+        Returns:
+            List[Tuple[str, str, int]]: Тройки (отпечаток, описание, количество) по убыванию количества.
+        """
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        top = sorted(counts.items(), key=lambda item: -item[1][0])[:limit]
+        return [(fingerprint, description, count) for fingerprint, (count, description) in top]
@@ -19,13 +19,21 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=[
-        "colorlog",
+        "colorlog>=6,<7",
     ],
+    extras_require={
+        "json": ["orjson"],
+        "zstd": ["zstandard"],
+    },
+    entry_points={
+        "console_scripts": [
+            "profi_log=profi_log.cli:main",
+        ],
+    },
 )
\ No newline at end of file
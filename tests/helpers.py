@@ -0,0 +1,30 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+
+def make_record(msg, *args, name="test", level=logging.INFO, exc_info=None, created=None):
+    record = logging.LogRecord(name, level, __file__, 0, msg, args or None, exc_info)
+    if created is not None:
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+    return record
+
+
+class LogFileTestCase(unittest.TestCase):
+    """
+    Тест с временным каталогом temp_dir и путем к файлу лога log_file в нем.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self, name="test.log"):
+        with open(os.path.join(self.temp_dir, name), "r", encoding="utf-8") as f:
+            return f.read()
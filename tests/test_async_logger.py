@@ -0,0 +1,83 @@
+import unittest
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from profi_log import AsyncMasterLogger
+
+
+class TestAsyncMasterLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = AsyncMasterLogger(self.log_file, name="test_async_logger")
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_loop_thread_only_enqueues(self):
+        emit_threads = []
+        file_handler = self.logger._dispatcher.handlers[0]
+        original_emit = file_handler.emit
+
+        def emit(record):
+            emit_threads.append(threading.current_thread())
+            original_emit(record)
+
+        file_handler.emit = emit
+
+        async def main():
+            for i in range(10):
+                self.logger.info(f"Сообщение {i}")
+            await self.logger.aflush()
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(main())
+
+        self.assertEqual(len(emit_threads), 10)
+        self.assertNotIn(loop_thread, emit_threads)
+        self.assertEqual(self.read_log().count("Сообщение"), 10)
+
+    def test_per_loop_queues(self):
+        async def main():
+            self.logger.info("Из цикла событий")
+            return asyncio.get_running_loop()
+
+        first_loop = asyncio.new_event_loop()
+        second_loop = asyncio.new_event_loop()
+        try:
+            first_loop.run_until_complete(main())
+            second_loop.run_until_complete(main())
+            self.assertIsNot(self.logger._dispatcher.get_writer(first_loop, create=False),
+                             self.logger._dispatcher.get_writer(second_loop, create=False))
+        finally:
+            first_loop.close()
+            second_loop.close()
+
+        self.logger.flush()
+        self.assertEqual(self.read_log().count("Из цикла событий"), 2)
+
+    def test_outside_loop_is_synchronous(self):
+        self.logger.warning("Без цикла событий")
+        self.assertIn("Без цикла событий", self.read_log())
+
+    def test_close_drains_queue(self):
+        async def main():
+            self.logger.error("Последнее сообщение")
+
+        asyncio.run(main())
+        self.logger.close()
+        self.assertIn("Последнее сообщение", self.read_log())
+        self.assertEqual(logging.getLogger("test_async_logger").handlers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
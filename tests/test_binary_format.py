@@ -0,0 +1,99 @@
+import unittest
+import decimal
+import enum
+import io
+import sys
+import logging
+from contextlib import redirect_stdout
+from profi_log import MasterLogger
+from profi_log.binary_format import BinaryFileHandler, decode_file, decode_records
+from profi_log.cli import main
+from helpers import LogFileTestCase, make_record
+
+
+class TestBinaryFormat(LogFileTestCase):
+
+    def test_roundtrip_matches_text_format(self):
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        records = [
+            make_record("Запрос %s выполнен за %d мс (%.2f)", "SELECT", 42, 0.5),
+            make_record("Без аргументов", level=logging.WARNING),
+            make_record("Значения: %s %s %s", None, True, b"raw"),
+        ]
+        handler = BinaryFileHandler(self.log_file)
+        for record in records:
+            handler.handle(record)
+        handler.close()
+
+        self.assertEqual(list(decode_file(self.log_file)), [formatter.format(record) for record in records])
+
+    def test_objects_converted_as_template_requires(self):
+        class Obj:
+            def __str__(self):
+                return "STR"
+
+            def __repr__(self):
+                return "REPR объект"
+
+        formatter = logging.Formatter('%(message)s')
+        records = [
+            make_record("obj %r %a %s", Obj(), Obj(), Obj()),
+            make_record("%d %x %5.1f %*d", enum.IntEnum("Color", "RED")(1), enum.IntEnum("Bits", "A B")(2),
+                        decimal.Decimal("2.25"), 4, enum.IntEnum("Size", "S")(1)),
+            make_record("строка %r", "текст"),
+        ]
+        handler = BinaryFileHandler(self.log_file)
+        for record in records:
+            handler.handle(record)
+        handler.close()
+
+        self.assertEqual(list(decode_file(self.log_file, '%(message)s')),
+                         [formatter.format(record) for record in records])
+
+    def test_templates_are_interned(self):
+        handler = BinaryFileHandler(self.log_file)
+        for i in range(100):
+            handler.handle(make_record("Запрос %s выполнен за %d мс", "SELECT", i))
+        handler.close()
+
+        with open(self.log_file, "rb") as f:
+            data = f.read()
+        self.assertEqual(data.count("Запрос".encode("utf-8")), 1)
+        self.assertEqual(len(list(decode_records(data))), 100)
+
+    def test_exception_text(self):
+        handler = BinaryFileHandler(self.log_file)
+        try:
+            raise ValueError("сбой")
+        except ValueError:
+            record = logging.LogRecord("app", logging.ERROR, __file__, 0, "Ошибка", None, sys.exc_info())
+        handler.handle(record)
+        handler.close()
+
+        self.assertIn("ValueError: сбой", "\n".join(decode_file(self.log_file)))
+
+    def test_append_and_truncated_tail(self):
+        for i in range(2):
+            handler = BinaryFileHandler(self.log_file)
+            handler.handle(make_record("Запуск %d", i))
+            handler.close()
+        with open(self.log_file, "ab") as f:
+            f.write(b"\x02\x80")
+
+        lines = list(decode_file(self.log_file))
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith("Запуск 1"))
+
+    def test_decode_command(self):
+        logger = MasterLogger(self.log_file, name="test_binary", file_sink="binary")
+        logger.info("Сообщение %s", "из двоичного лога")
+        logger.close()
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main(["decode", self.log_file]), 0)
+        self.assertIn("test_binary - INFO - Сообщение из двоичного лога", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
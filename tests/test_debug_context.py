@@ -0,0 +1,194 @@
+import unittest
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from profi_log import MasterLogger, AsyncMasterLogger
+from profi_log.debug_context import DebugContextHandler
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestDebugContextHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.target = ListHandler()
+        self.handler = DebugContextHandler(capacity=2)
+        self.handler.handlers.append(self.target)
+
+    def make_record(self, level, msg):
+        return logging.LogRecord("test", level, __file__, 0, msg, None, None)
+
+    def messages(self):
+        return [record.msg for record in self.target.records]
+
+    def test_keeps_last_records_until_error(self):
+        for i in range(3):
+            self.handler.handle(self.make_record(logging.DEBUG, f"debug {i}"))
+        self.handler.handle(self.make_record(logging.INFO, "info"))
+        self.assertEqual(self.messages(), ["info"])
+
+        self.handler.handle(self.make_record(logging.ERROR, "error"))
+        self.assertEqual(self.messages(), ["info", "debug 1", "debug 2", "error"])
+
+        self.handler.handle(self.make_record(logging.ERROR, "error again"))
+        self.assertEqual(self.messages()[-1:], ["error again"])
+        self.assertEqual(len(self.target.records), 5)
+
+    def test_threads_have_separate_buffers(self):
+        thread = threading.Thread(target=self.handler.handle, args=(self.make_record(logging.DEBUG, "other"),))
+        thread.start()
+        thread.join()
+        self.handler.handle(self.make_record(logging.DEBUG, "own"))
+        self.handler.handle(self.make_record(logging.ERROR, "error"))
+        self.assertEqual(self.messages(), ["own", "error"])
+
+    def test_tasks_have_separate_buffers(self):
+        async def request(name, fail):
+            self.handler.handle(self.make_record(logging.DEBUG, f"{name} debug"))
+            await asyncio.sleep(0)
+            if fail:
+                self.handler.handle(self.make_record(logging.ERROR, f"{name} error"))
+
+        async def main():
+            await asyncio.gather(request("a", False), request("b", True))
+
+        asyncio.run(main())
+        self.assertEqual(self.messages(), ["b debug", "b error"])
+
+    def test_discard(self):
+        self.handler.handle(self.make_record(logging.DEBUG, "debug"))
+        self.handler.discard()
+        self.handler.handle(self.make_record(logging.ERROR, "error"))
+        self.assertEqual(self.messages(), ["error"])
+
+    def test_respects_handler_level(self):
+        self.target.setLevel(logging.INFO)
+        self.handler.handle(self.make_record(logging.DEBUG, "debug"))
+        self.handler.handle(self.make_record(logging.ERROR, "error"))
+        self.assertEqual(self.messages(), ["error"])
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            DebugContextHandler(capacity=0)
+
+
+class TestMasterLoggerDebugContext(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self, logger):
+        logger.close()
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_debug_written_before_error(self):
+        logger = MasterLogger(self.log_file, name="test_debug_context", debug_context=2, report_interval=0)
+        child = logger.get_logger("test_debug_context.db")
+        self.assertTrue(child.debug_enabled)
+        for i in range(3):
+            child.debug("step %d", i)
+        logger.info("request")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.log_exception("failed")
+        logger.debug("after")
+
+        lines = self.read_log(logger)
+        self.assertIn("request", lines[0])
+        self.assertIn("step 1", lines[1])
+        self.assertIn("step 2", lines[2])
+        self.assertIn("failed", lines[3])
+        self.assertTrue(all("step 0" not in line and "after" not in line for line in lines))
+
+    def test_async_mode(self):
+        logger = MasterLogger(self.log_file, name="test_debug_context_async", debug_context=5, async_mode=True,
+                              report_interval=0)
+        logger.debug("context")
+        logger.error("error")
+        lines = self.read_log(logger)
+        self.assertEqual(len(lines), 2)
+        self.assertIn("context", lines[0])
+
+    def test_async_master_logger(self):
+        logger = AsyncMasterLogger(self.log_file, name="test_debug_context_loop", debug_context=5,
+                                   report_interval=0)
+
+        async def request(name, fail):
+            logger.debug("%s context", name)
+            await asyncio.sleep(0)
+            if fail:
+                logger.error("%s error", name)
+
+        async def main():
+            await asyncio.gather(request("a", False), request("b", True))
+            await logger.aflush()
+
+        asyncio.run(main())
+        lines = self.read_log(logger)
+        self.assertEqual(len(lines), 2)
+        self.assertIn("b context", lines[0])
+        self.assertIn("b error", lines[1])
+
+    def test_temporary_log_level_writes_immediately(self):
+        logger = MasterLogger(self.log_file, name="test_debug_context_scoped", debug_context=5,
+                              report_interval=0)
+        logger.debug("buffered before")
+        with logger.temporary_log_level("DEBUG"):
+            logger.debug("requested")
+            other = threading.Thread(target=logger.debug, args=("other thread",))
+            other.start()
+            other.join()
+        logger.debug("buffered after")
+        logger.flush()
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            self.assertIn("requested", f.read())
+
+        logger.error("error")
+        lines = self.read_log(logger)
+        self.assertEqual(len(lines), 4)
+        self.assertIn("requested", lines[0])
+        self.assertIn("buffered before", lines[1])
+        self.assertIn("buffered after", lines[2])
+        self.assertNotIn("other thread", "".join(lines))
+
+    def test_ancestor_handlers_get_records_after_buffer(self):
+        parent = logging.getLogger("test_debug_context_parent")
+        target = ListHandler()
+        parent.addHandler(target)
+        self.addCleanup(parent.removeHandler, target)
+        logger = MasterLogger(self.log_file, name="test_debug_context_parent.app", debug_context=5,
+                              report_interval=0)
+        child = logger.get_logger("test_debug_context_parent.app.db")
+        child.debug("buffered")
+        self.assertEqual(target.records, [])
+
+        logger.error("error")
+        self.assertEqual([record.msg for record in target.records], ["buffered", "error"])
+        logger.close()
+        self.assertTrue(logging.getLogger("test_debug_context_parent.app").propagate)
+
+    def test_disabled_by_default(self):
+        logger = MasterLogger(self.log_file, name="test_debug_context_off", report_interval=0)
+        self.assertFalse(logger.debug_enabled)
+        logger.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import unittest
+import logging
+import smtplib
+import socket
+from email.message import EmailMessage
+from unittest.mock import patch
+from profi_log.email_handler import SMTPConnection, BackgroundEmailHandler, FingerprintTable, record_fingerprint
+
+
+class FakeSMTP:
+    """
+    Заменитель SMTP-сервера: запоминает подключения и отправленные письма.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.server.connections += 1
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.server.logins.append(user)
+
+    def send_message(self, msg):
+        if self.server.failures:
+            self.server.failures -= 1
+            raise self.server.error
+        self.server.messages.append(msg)
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeSMTPServer:
+
+    def __init__(self, failures=0, error=None):
+        self.connections = 0
+        self.logins = []
+        self.messages = []
+        self.failures = failures
+        self.error = error or smtplib.SMTPServerDisconnected("соединение закрыто")
+
+    def factory(self, host, port):
+        return FakeSMTP(self)
+
+
+def make_record(msg):
+    return logging.LogRecord("test", logging.CRITICAL, __file__, 0, msg, None, None)
+
+
+class TestSMTPConnection(unittest.TestCase):
+
+    def make_connection(self, server):
+        return SMTPConnection("smtp.example.com", 587, "sender@example.com", "password",
+                              smtp_factory=server.factory)
+
+    def test_reconnects_on_connection_errors(self):
+        for error in (smtplib.SMTPServerDisconnected("закрыто"), ConnectionResetError(), socket.timeout()):
+            server = FakeSMTPServer(failures=1, error=error)
+            self.make_connection(server).send(EmailMessage())
+            self.assertEqual(len(server.messages), 1)
+            self.assertEqual(server.connections, 2)
+
+    def test_smtp_errors_not_retried(self):
+        server = FakeSMTPServer(failures=1, error=smtplib.SMTPRecipientsRefused({}))
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            self.make_connection(server).send(EmailMessage())
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.messages, [])
+
+
+class TestBackgroundEmailHandler(unittest.TestCase):
+
+    def make_handler(self, server, **kwargs):
+        connection = SMTPConnection("smtp.example.com", 587, "sender@example.com", "password",
+                                    smtp_factory=server.factory)
+        handler = BackgroundEmailHandler(connection, ["recipient@example.com"], **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_batches_records_into_digest(self):
+        server = FakeSMTPServer()
+        handler = self.make_handler(server, batch_window=60)
+        for i in range(3):
+            handler.handle(make_record(f"Сбой {i}"))
+        handler.flush()
+
+        self.assertEqual(len(server.messages), 1)
+        self.assertEqual(server.messages[0]['Subject'], "Критическая ошибка: Сбой 0 (и еще 2)")
+        self.assertIn("Сбой 2", server.messages[0].get_content())
+
+    def test_reuses_connection(self):
+        server = FakeSMTPServer()
+        handler = self.make_handler(server, batch_window=0)
+        for i in range(3):
+            handler.handle(make_record(f"Сбой {i}"))
+            handler.flush()
+
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.logins, ["sender@example.com"])
+
+    def test_retries_with_reconnect(self):
+        server = FakeSMTPServer(failures=3)
+        handler = self.make_handler(server, batch_window=0, retry_backoff=0)
+        handler.handle(make_record("Сбой"))
+        handler.flush()
+
+        self.assertEqual(len(server.messages), 1)
+        self.assertGreater(server.connections, 1)
+
+    def test_close_sends_pending(self):
+        server = FakeSMTPServer()
+        handler = self.make_handler(server, batch_window=60)
+        handler.handle(make_record("Последний сбой"))
+        handler.close()
+
+        self.assertEqual(len(server.messages), 1)
+
+
+class TestDeduplication(unittest.TestCase):
+
+    def test_fingerprint_ignores_arguments(self):
+        first = logging.LogRecord("db", logging.CRITICAL, __file__, 0, "Нет соединения с %s", ("host-1",), None)
+        second = logging.LogRecord("db", logging.CRITICAL, __file__, 0, "Нет соединения с %s", ("host-2",), None)
+        other = logging.LogRecord("cache", logging.CRITICAL, __file__, 0, "Нет соединения с %s", ("host-1",), None)
+
+        self.assertEqual(record_fingerprint(first)[0], record_fingerprint(second)[0])
+        self.assertNotEqual(record_fingerprint(first)[0], record_fingerprint(other)[0])
+
+    def test_fingerprint_includes_exception_location(self):
+        fingerprints = set()
+        for exc_type in (ValueError, KeyError):
+            try:
+                raise exc_type("сбой")
+            except Exception:
+                fingerprints.add(record_fingerprint(make_record("Ошибка"))[0])
+        self.assertEqual(len(fingerprints), 2)
+
+    @patch("profi_log.email_handler.time.monotonic", return_value=100.0)
+    def test_table_window_and_repeats(self, mock_monotonic):
+        table = FingerprintTable(window=60)
+        self.assertTrue(table.hit("a", "описание"))
+        self.assertFalse(table.hit("a", "описание"))
+        self.assertFalse(table.hit("a", "описание"))
+
+        mock_monotonic.return_value = 200.0
+        self.assertTrue(table.hit("a", "описание"))
+        self.assertEqual(table.take_repeats(), [("описание", 2)])
+        self.assertEqual(table.take_repeats(), [])
+
+    def test_table_is_bounded(self):
+        table = FingerprintTable(window=60, max_size=2)
+        for key in ("a", "b", "a", "c"):
+            table.hit(key, key)
+        self.assertEqual(list(table._entries), ["a", "c"])
+
+    def test_repeats_folded_into_next_email(self):
+        server = FakeSMTPServer()
+        connection = SMTPConnection("smtp.example.com", 587, "sender@example.com", "password",
+                                    smtp_factory=server.factory)
+        handler = BackgroundEmailHandler(connection, ["recipient@example.com"], batch_window=60, dedup_window=60)
+        self.addCleanup(handler.close)
+
+        for _ in range(1000):
+            handler.handle(make_record("База данных недоступна"))
+        handler.flush()
+
+        self.assertEqual(len(server.messages), 1)
+        self.assertEqual(server.messages[0]['Subject'], "Критическая ошибка: База данных недоступна")
+        self.assertIn("999 × test: База данных недоступна", server.messages[0].get_content())
+
+
+if __name__ == '__main__':
+    unittest.main()
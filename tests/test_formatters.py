@@ -0,0 +1,136 @@
+import unittest
+import json
+import logging
+import sys
+import time
+from unittest.mock import patch
+from profi_log import MasterLogger
+import colorlog
+from profi_log.formatters import CachedFormatter, CompiledColoredFormatter, CompiledFormatter, JsonFormatter, json_dumps
+from helpers import LogFileTestCase, make_record as make_log_record
+
+
+def make_record(msg, *args, **kwargs):
+    return make_log_record(msg, *args, name="app.api", created=1700000000.123456, **kwargs)
+
+
+class TestJsonFormatter(LogFileTestCase):
+
+    def test_fields(self):
+        record = make_record("Запрос %s", "GET /")
+        record.user_id = 42
+        data = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(data, {
+            "timestamp": "2023-11-14T22:13:20.123Z",
+            "level": "INFO",
+            "logger": "app.api",
+            "message": "Запрос GET /",
+            "extra": {"user_id": 42},
+        })
+
+    def test_exception(self):
+        try:
+            raise ValueError("сбой")
+        except ValueError:
+            record = make_record("Ошибка", level=logging.ERROR, exc_info=sys.exc_info())
+        data = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(data["level"], "ERROR")
+        self.assertIn("ValueError: сбой", data["exception"])
+
+    def test_non_serializable_extra(self):
+        record = make_record("Сообщение")
+        record.payload = object()
+        data = json.loads(JsonFormatter().format(record))
+        self.assertTrue(data["extra"]["payload"].startswith("<object object"))
+
+    def test_non_str_keys_and_big_int(self):
+        record = make_record("Сообщение")
+        record.counts = {1: 2, None: 3}
+        record.big = 2 ** 64
+        data = json.loads(JsonFormatter().format(record))
+        self.assertEqual(data["extra"], {"counts": {"1": 2, "null": 3}, "big": 2 ** 64})
+        self.assertEqual(json.loads(json_dumps({1: 2 ** 70})), {"1": 2 ** 70})
+
+    def test_master_logger_json_format(self):
+        logger = MasterLogger(self.log_file, name="test_json", log_format="json")
+        logger.info("Первое", extra={"request_id": "abc"})
+        logger.warning("Второе")
+        logger.close()
+
+        lines = [json.loads(line) for line in self.read_log().splitlines()]
+        self.assertEqual([line["message"] for line in lines], ["Первое", "Второе"])
+        self.assertEqual(lines[0]["extra"], {"request_id": "abc"})
+
+
+class TestCachedFormatter(unittest.TestCase):
+
+    def test_local_matches_logging_formatter(self):
+        record = make_record("Сообщение")
+        self.assertEqual(CachedFormatter('%(asctime)s %(message)s').format(record),
+                         logging.Formatter('%(asctime)s %(message)s').format(record))
+
+    def test_strftime_once_per_second(self):
+        formatter = CachedFormatter(timestamp='iso_utc')
+        with patch('profi_log.formatters.time.strftime', wraps=time.strftime) as strftime:
+            first = make_record("первая")
+            second = make_record("вторая")
+            second.created += 0.5
+            second.msecs = 623.456
+            self.assertEqual(formatter.formatTime(first), "2023-11-14T22:13:20.123Z")
+            self.assertEqual(formatter.formatTime(second), "2023-11-14T22:13:20.623Z")
+            self.assertEqual(strftime.call_count, 1)
+
+            third = make_record("третья")
+            third.created += 1
+            self.assertEqual(formatter.formatTime(third), "2023-11-14T22:13:21.123Z")
+            self.assertEqual(strftime.call_count, 2)
+
+    def test_epoch_ns(self):
+        record = make_record("Сообщение")
+        self.assertEqual(CachedFormatter(timestamp='epoch_ns').formatTime(record), str(int(record.created * 1e9)))
+        data = json.loads(JsonFormatter(timestamp='epoch_ns').format(record))
+        self.assertEqual(data["timestamp"], int(record.created * 1e9))
+
+    def test_unknown_timestamp(self):
+        with self.assertRaises(ValueError):
+            CachedFormatter(timestamp='unix')
+
+
+class TestCompiledFormatter(unittest.TestCase):
+
+    def test_matches_logging_formatter(self):
+        try:
+            raise ValueError("сбой")
+        except ValueError:
+            exc_info = sys.exc_info()
+        formats = (
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            '%(levelname)-8s|%(lineno)04d|%(relativeCreated).1f 100%% %(message)r',
+        )
+        for fmt in formats:
+            for record in (make_record("Запрос %s", "GET /"), make_record("Ошибка", exc_info=exc_info)):
+                self.assertEqual(CompiledFormatter(fmt).format(record), logging.Formatter(fmt).format(record))
+
+    def test_uses_time(self):
+        self.assertTrue(CompiledFormatter('%(asctime)s %(message)s').usesTime())
+        self.assertFalse(CompiledFormatter('%(message)s').usesTime())
+
+    def test_colored(self):
+        fmt = '%(log_color)s%(levelname)s - %(message)s'
+        record = make_record("Сообщение")
+        self.assertEqual(CompiledColoredFormatter(fmt, force_color=True).format(record),
+                         colorlog.ColoredFormatter(fmt, force_color=True).format(record))
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            CompiledFormatter('100% %(message)s')
+        with self.assertRaises(ValueError):
+            CompiledFormatter('{message}', style='{')
+        with self.assertRaises(ValueError):
+            CompiledFormatter('%(missing)s %(message)s').format(make_record("Сообщение"))
+
+
+if __name__ == '__main__':
+    unittest.main()
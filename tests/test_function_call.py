@@ -0,0 +1,100 @@
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+from profi_log import MasterLogger
+
+
+class TestAsyncAwareFunctionCall(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = MasterLogger(self.log_file, name="test_function_call", report_interval=0)
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        self.logger.flush()
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_coroutine_result(self):
+        @self.logger.log_function_call()
+        async def fetch(value):
+            await asyncio.sleep(0)
+            return value * 2
+
+        self.assertEqual(asyncio.run(fetch(21)), 42)
+        self.assertIn("Функция fetch завершила выполнение. Результат: 42", self.read_log())
+        self.assertNotIn("coroutine", self.read_log())
+
+    def test_coroutine_does_not_emit_on_loop_thread(self):
+        loop_threads = []
+        original_call_handlers = self.logger._root_logger.callHandlers
+
+        def call_handlers(record):
+            loop_threads.append(threading.current_thread())
+            original_call_handlers(record)
+
+        @self.logger.log_function_call()
+        async def fetch():
+            return None
+
+        with patch.object(self.logger._root_logger, "callHandlers", side_effect=call_handlers):
+            asyncio.run(fetch())
+            self.logger.flush()
+
+        self.assertEqual(len(loop_threads), 2)
+        self.assertNotIn(threading.main_thread(), loop_threads)
+
+    def test_generator_logs_after_exhaustion(self):
+        @self.logger.log_function_call()
+        def numbers(count):
+            yield from range(count)
+            return "готово"
+
+        gen = numbers(3)
+        self.assertEqual(next(gen), 0)
+        self.assertNotIn("завершила выполнение", self.read_log())
+
+        self.assertEqual(list(gen), [1, 2])
+        self.assertIn("Функция numbers завершила выполнение. Результат: готово", self.read_log())
+
+    def test_async_generator(self):
+        @self.logger.log_function_call(log_args=False)
+        async def ticks(count):
+            for i in range(count):
+                await asyncio.sleep(0)
+                yield i
+
+        async def consume():
+            return [item async for item in ticks(3)]
+
+        self.assertEqual(asyncio.run(consume()), [0, 1, 2])
+        log_contents = self.read_log()
+        self.assertIn("Вызов функции ticks", log_contents)
+        self.assertIn("Функция ticks завершила выполнение.", log_contents)
+
+    def test_arguments_captured_before_call(self):
+        self.logger.close()
+        self.logger = MasterLogger(self.log_file, name="test_function_call", async_mode=True, report_interval=0)
+
+        @self.logger.log_function_call()
+        def consume(items):
+            items.clear()
+            return items
+
+        consume([1, 2, 3])
+        log_contents = self.read_log()
+        self.assertIn("Вызов функции consume с аргументами: ([1, 2, 3],), {}", log_contents)
+        self.assertIn("Результат: []", log_contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
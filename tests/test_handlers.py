@@ -0,0 +1,121 @@
+import unittest
+import logging
+import os
+import queue
+from profi_log.master_logger import MasterLogger
+from profi_log.handlers import BoundedQueueHandler, BufferedRotatingFileHandler
+from helpers import LogFileTestCase, make_record
+
+
+class ShortWriteStream:
+    """Файл, который за один вызов write записывает не больше 4 байт."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        return self.stream.write(data[:4])
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+
+    def test_drop_newest(self):
+        log_queue = queue.Queue(2)
+        handler = BoundedQueueHandler(log_queue, overflow_policy='drop_newest')
+        for i in range(5):
+            handler.handle(make_record(f"msg {i}"))
+
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual([log_queue.get_nowait().msg for _ in range(2)], ["msg 0", "msg 1"])
+
+    def test_drop_oldest(self):
+        log_queue = queue.Queue(2)
+        handler = BoundedQueueHandler(log_queue, overflow_policy='drop_oldest')
+        for i in range(5):
+            handler.handle(make_record(f"msg {i}"))
+
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual([log_queue.get_nowait().msg for _ in range(2)], ["msg 3", "msg 4"])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(), overflow_policy='ignore')
+
+
+class TestAsyncMasterLoggerFile(LogFileTestCase):
+
+    def test_async_mode_writes_on_close(self):
+        logger = MasterLogger(self.log_file, name="test_async", async_mode=True, queue_size=100)
+        for i in range(50):
+            logger.info(f"Сообщение {i}")
+        logger.close()
+
+        self.assertEqual(self.read_log().count("Сообщение"), 50)
+        self.assertEqual(logger.dropped_records, 0)
+        self.assertEqual(logging.getLogger("test_async").handlers, [])
+
+    def test_async_mode_flush(self):
+        logger = MasterLogger(self.log_file, name="test_async_flush", async_mode=True)
+        logger.warning("Предупреждение")
+        logger.flush()
+
+        self.assertIn("Предупреждение", self.read_log())
+        logger.close()
+
+
+class TestBufferedRotatingFileHandler(LogFileTestCase):
+
+    def test_buffers_until_record_threshold(self):
+        handler = BufferedRotatingFileHandler(self.log_file, buffer_records=3, flush_interval=0)
+        handler.handle(make_record("первая"))
+        handler.handle(make_record("вторая"))
+        self.assertEqual(self.read_log(), "")
+
+        handler.handle(make_record("третья"))
+        self.assertEqual(self.read_log(), "первая\nвторая\nтретья\n")
+        handler.close()
+
+    def test_error_flushes_immediately(self):
+        handler = BufferedRotatingFileHandler(self.log_file, flush_interval=0)
+        handler.handle(make_record("информация"))
+        record = make_record("ошибка")
+        record.levelno = logging.ERROR
+        handler.handle(record)
+
+        self.assertEqual(self.read_log(), "информация\nошибка\n")
+        handler.close()
+
+    def test_short_writes_are_completed(self):
+        handler = BufferedRotatingFileHandler(self.log_file, buffer_records=2, flush_interval=0)
+        handler.stream = ShortWriteStream(handler._open())
+        handler.handle(make_record("информация"))
+        handler.handle(make_record("ошибка"))
+
+        self.assertEqual(self.read_log(), "информация\nошибка\n")
+        handler.close()
+
+    def test_close_writes_buffer_and_rotates(self):
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=20, backupCount=1, buffer_records=1,
+                                              flush_interval=0)
+        handler.handle(make_record("a" * 15))
+        handler.handle(make_record("b" * 15))
+        handler.close()
+
+        self.assertEqual(self.read_log(), "b" * 15 + "\n")
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+
+    def test_master_logger_buffered_sink(self):
+        logger = MasterLogger(self.log_file, name="test_buffered", file_sink="buffered",
+                              sink_options={"flush_interval": 0})
+        logger.info("Буферизованное сообщение")
+        self.assertEqual(self.read_log(), "")
+
+        logger.close()
+        self.assertIn("Буферизованное сообщение", self.read_log())
+
+
+if __name__ == '__main__':
+    unittest.main()
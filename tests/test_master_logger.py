@@ -1,9 +1,11 @@
 import unittest
 import logging
 import os
+import shutil
 import tempfile
+import weakref
 from unittest.mock import patch, MagicMock
-from profi_log.master_logger import MasterLogger
+from profi_log.master_logger import MasterLogger, LoggerProxy
 
 
 class TestMasterLogger(unittest.TestCase):
@@ -73,9 +75,10 @@ class TestMasterLogger(unittest.TestCase):
         )
 
         self.logger.critical("Тестовое критическое сообщение")
+        self.logger.flush()
 
         mock_smtp.assert_called_once_with("smtp.example.com", 587)
-        mock_smtp.return_value.__enter__.return_value.send_message.assert_called_once()
+        mock_smtp.return_value.send_message.assert_called_once()
 
     def test_log_exception(self):
         self.logger = MasterLogger(self.log_file)
@@ -108,5 +111,118 @@ class TestMasterLogger(unittest.TestCase):
         self.assertEqual(result, 7)
 
 
+class TestLoggerProxy(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = MasterLogger(os.path.join(self.temp_dir, "test.log"), name="test_proxy")
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_level_methods_are_bound(self):
+        proxy = self.logger.get_logger("test_proxy.child")
+        self.assertIsInstance(proxy, LoggerProxy)
+        self.assertEqual(proxy.info, logging.getLogger("test_proxy.child").info)
+        self.assertEqual(proxy.log_exception, self.logger.log_exception)
+        with self.assertRaises(AttributeError):
+            object.__getattribute__(proxy, "__dict__")
+
+    def test_fallback_attributes(self):
+        proxy = self.logger.get_logger("test_proxy.child")
+        self.assertEqual(proxy.name, "test_proxy.child")
+        self.assertEqual(proxy.log_file_name, self.logger.log_file_name)
+        with self.assertRaises(AttributeError):
+            proxy.missing_attribute
+
+    def test_get_logger_is_cached(self):
+        proxy = self.logger.get_logger("test_proxy.cached")
+        with patch.object(logging.Logger, "setLevel") as mock_set_level:
+            self.assertIs(self.logger.get_logger("test_proxy.cached"), proxy)
+        mock_set_level.assert_not_called()
+        self.assertIn("test_proxy.cached", self.logger.get_registered_loggers())
+
+    def test_configure_loggers(self):
+        first = self.logger.get_logger("test_proxy.first")
+        second = self.logger.get_logger("test_proxy.second")
+
+        self.logger.configure_loggers("DEBUG", names=["test_proxy.first"])
+        self.assertEqual(first.level, logging.DEBUG)
+        self.assertEqual(second.level, logging.INFO)
+
+        self.logger.configure_loggers("WARNING")
+        self.assertEqual(first.level, logging.WARNING)
+        self.assertEqual(second.level, logging.WARNING)
+
+
+class TestLevelFlags(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = MasterLogger(os.path.join(self.temp_dir, "test.log"), name="test_flags", level="INFO")
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_flags_follow_temporary_log_level(self):
+        proxy = self.logger.get_logger("test_flags.child")
+        proxy.setLevel(logging.NOTSET)
+        self.assertFalse(self.logger.debug_enabled)
+        self.assertTrue(self.logger.info_enabled)
+        self.assertFalse(proxy.debug_enabled)
+
+        with self.logger.temporary_log_level("DEBUG"):
+            self.assertTrue(self.logger.debug_enabled)
+            self.assertTrue(proxy.debug_enabled)
+        self.assertFalse(self.logger.debug_enabled)
+        self.assertFalse(proxy.debug_enabled)
+
+    def test_flags_follow_set_level(self):
+        proxy = self.logger.get_logger("test_flags.child")
+        proxy.setLevel(logging.ERROR)
+        self.assertFalse(proxy.warning_enabled)
+        self.assertTrue(proxy.error_enabled)
+
+        self.logger.set_level("WARNING")
+        self.assertFalse(self.logger.info_enabled)
+        self.assertTrue(self.logger.warning_enabled)
+
+    def test_flags_follow_standard_set_level(self):
+        proxy = self.logger.get_logger("test_flags.child")
+        logging.getLogger("test_flags").setLevel(logging.DEBUG)
+        logging.getLogger("test_flags.child").setLevel(logging.DEBUG)
+        self.assertTrue(self.logger.debug_enabled)
+        self.assertTrue(proxy.debug_enabled)
+
+        with patch.object(self.logger._root_logger, "debug") as mock_debug:
+            self.logger.debug("Должно логироваться")
+        mock_debug.assert_called_once()
+
+        logging.disable(logging.CRITICAL)
+        try:
+            self.assertFalse(self.logger.critical_enabled)
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertTrue(self.logger.critical_enabled)
+
+    def test_clear_cache_restored_after_last_close(self):
+        manager = logging.Logger.manager
+        self.assertIn("_clear_cache", vars(manager))
+        with patch("profi_log.master_logger._level_watchers", weakref.WeakSet([self.logger])):
+            self.logger.close()
+            self.assertNotIn("_clear_cache", vars(manager))
+        other = MasterLogger(os.path.join(self.temp_dir, "other.log"), name="test_flags_other", level="INFO")
+        self.addCleanup(other.close)
+        logging.getLogger("test_flags_other").setLevel(logging.DEBUG)
+        self.assertTrue(other.debug_enabled)
+
+    def test_disabled_level_short_circuits(self):
+        with patch.object(self.logger._root_logger, "debug") as mock_debug:
+            self.logger.debug("Не должно логироваться")
+        mock_debug.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
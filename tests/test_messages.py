@@ -0,0 +1,65 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+from profi_log import MasterLogger, LazyMessage
+
+
+class TestLazyMessage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = MasterLogger(self.log_file, name="test_lazy", level="INFO")
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_renders_once(self):
+        func = MagicMock(return_value="готово")
+        message = LazyMessage(func, 1, key=2)
+        self.assertEqual(str(message), "готово")
+        self.assertEqual(str(message), "готово")
+        func.assert_called_once_with(1, key=2)
+
+    def test_not_rendered_for_disabled_level(self):
+        func = MagicMock(return_value="отладка")
+        self.logger.debug(LazyMessage(func))
+        self.logger.info(LazyMessage("Значение: {}".format, 42))
+        self.logger.flush()
+
+        func.assert_not_called()
+        self.assertIn("Значение: 42", self.read_log())
+
+    def test_log_function_call_skips_formatting_when_disabled(self):
+        argument = MagicMock()
+        argument.__repr__ = MagicMock(return_value="argument")
+
+        @self.logger.log_function_call()
+        def test_function(value):
+            return value
+
+        self.logger.set_level("WARNING")
+        test_function(argument)
+        argument.__repr__.assert_not_called()
+        self.assertEqual(self.read_log(), "")
+
+    def test_log_exception_renders_traceback(self):
+        try:
+            raise KeyError("ключ")
+        except KeyError:
+            self.logger.log_exception("Произошла ошибка")
+        self.logger.flush()
+
+        self.assertIn("Произошла ошибка\nTraceback", self.read_log())
+        self.assertIn("KeyError: 'ключ'", self.read_log())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import os
+from profi_log import MasterLogger
+from profi_log.mmap_handler import MmapFileHandler, read_segment, HEADER_SIZE
+from helpers import LogFileTestCase, make_record
+
+
+class TestMmapFileHandler(LogFileTestCase):
+
+    def test_write_and_read_segment(self):
+        handler = MmapFileHandler(self.log_file, segment_size=4096)
+        handler.handle(make_record("первая"))
+        handler.handle(make_record("вторая"))
+        handler.close()
+
+        self.assertEqual(os.path.getsize(self.log_file), 4096)
+        self.assertEqual(read_segment(self.log_file), "первая\nвторая\n")
+
+    def test_recover_without_close(self):
+        handler = MmapFileHandler(self.log_file, segment_size=4096)
+        handler.handle(make_record("до сбоя"))
+
+        # Процесс "упал": сегмент не закрыт, но данные и смещение уже в отображении
+        self.assertEqual(read_segment(self.log_file), "до сбоя\n")
+        handler.close()
+
+    def test_reopen_appends(self):
+        handler = MmapFileHandler(self.log_file, segment_size=4096)
+        handler.handle(make_record("первый запуск"))
+        handler.close()
+
+        handler = MmapFileHandler(self.log_file, segment_size=4096)
+        handler.handle(make_record("второй запуск"))
+        handler.close()
+
+        self.assertEqual(read_segment(self.log_file), "первый запуск\nвторой запуск\n")
+
+    def test_rotation_when_segment_full(self):
+        handler = MmapFileHandler(self.log_file, segment_size=HEADER_SIZE + 20, backupCount=2)
+        for msg in ("a" * 9, "b" * 9, "c" * 9):
+            handler.handle(make_record(msg))
+        handler.close()
+
+        self.assertEqual(read_segment(self.log_file + ".1"), "a" * 9 + "\n" + "b" * 9 + "\n")
+        self.assertEqual(read_segment(self.log_file), "c" * 9 + "\n")
+
+    def test_master_logger_mmap_sink(self):
+        logger = MasterLogger(self.log_file, name="test_mmap", file_sink="mmap", max_bytes=1024 * 1024)
+        logger.info("Сообщение в сегменте")
+        logger.close()
+
+        self.assertIn("Сообщение в сегменте", read_segment(self.log_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import multiprocessing
+import os
+from profi_log import MasterLogger
+from profi_log.multiprocess_handler import MultiprocessFileHandler
+from helpers import LogFileTestCase, make_record
+
+
+def write_records(log_file, worker, count):
+    handler = MultiprocessFileHandler(log_file, maxBytes=2000, backupCount=1000)
+    for i in range(count):
+        handler.handle(make_record(f"{worker}:{i}:" + "x" * 50))
+    handler.close()
+
+
+class TestMultiprocessFileHandler(LogFileTestCase):
+
+    def read_all_lines(self):
+        lines = []
+        for name in os.listdir(self.temp_dir):
+            if name != "test.log.lock":
+                lines.extend(self.read_log(name).splitlines())
+        return lines
+
+    def test_rotation_keeps_backups(self):
+        handler = MultiprocessFileHandler(self.log_file, maxBytes=20, backupCount=2)
+        for i in range(4):
+            handler.handle(make_record(f"{i}" * 15))
+        handler.close()
+
+        self.assertEqual(self.read_log("test.log.1"), "2" * 15 + "\n")
+        self.assertFalse(os.path.exists(self.log_file + ".3"))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "требуется fork")
+    def test_processes_do_not_lose_records(self):
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=write_records, args=(self.log_file, worker, 300)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        lines = self.read_all_lines()
+        self.assertEqual(len(lines), 4 * 300)
+        self.assertEqual(len(set(lines)), 4 * 300)
+        self.assertTrue(all(line.endswith("x" * 50) for line in lines))
+
+    def test_master_logger_multiprocess_sink(self):
+        logger = MasterLogger(self.log_file, name="test_multiprocess", file_sink="multiprocess")
+        logger.info("Сообщение")
+        logger.close()
+        self.assertIn("Сообщение", self.read_log())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import shutil
+import tempfile
+import types
+from profi_log import MasterLogger
+from profi_log.profiling import LatencyHistogram, bucket_index, bucket_upper_bound
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_bucket_bounds(self):
+        for value in (0, 31, 32, 33, 1000, 123456789, 2 ** 40 + 12345):
+            upper = bucket_upper_bound(bucket_index(value))
+            self.assertGreaterEqual(upper, value)
+            self.assertLessEqual(upper - value, max(value // 16, 1))
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram("func")
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+
+        stats = histogram.snapshot(reset=True)
+        self.assertEqual(stats['count'], 1000)
+        self.assertAlmostEqual(stats['p50'], 500000, delta=500000 / 16)
+        self.assertAlmostEqual(stats['p99'], 990000, delta=990000 / 16)
+        self.assertEqual(stats['max'], 1000000)
+        self.assertEqual(histogram.snapshot()['count'], 0)
+
+
+class TestFunctionTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = MasterLogger(self.log_file, name="test_profiling", report_interval=0)
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_duration_in_finish_message(self):
+        @self.logger.log_function_call()
+        def add(a, b):
+            return a + b
+
+        add(1, 2)
+        self.assertRegex(self.read_log(), r"Результат: 3\. Время выполнения: \d+\.\d{3} мс")
+
+    def test_histogram_report(self):
+        @self.logger.log_function_call(histogram=True, sample_rate=0.0)
+        def hot_function():
+            return None
+
+        for _ in range(100):
+            hot_function()
+
+        stats = self.logger.get_latency_stats()
+        name = f"{__name__}.{hot_function.__qualname__}"
+        self.assertEqual(stats[name]['count'], 100)
+
+        self.logger.report()
+        self.assertIn(f"{name}: вызовов 100, p50", self.read_log())
+        self.assertEqual(self.logger.get_latency_stats()[name]['count'], 0)
+
+    def test_histogram_per_module(self):
+        def handler():
+            return None
+
+        other = types.FunctionType(handler.__code__, {}, handler.__name__)
+        other.__qualname__ = handler.__qualname__
+        other.__module__ = "other_module"
+        for func in (handler, other):
+            self.logger.log_function_call(histogram=True, sample_rate=0.0)(func)()
+
+        stats = self.logger.get_latency_stats()
+        self.assertEqual(stats[f"{__name__}.{handler.__qualname__}"]['count'], 1)
+        self.assertEqual(stats[f"other_module.{handler.__qualname__}"]['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import logging
+import os
+import shutil
+import tempfile
+from profi_log import MasterLogger
+from profi_log.rate_limit import RateLimitFilter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.consume(100.0) for _ in range(4)], [True, True, True, False])
+        self.assertTrue(bucket.consume(100.5))
+        self.assertFalse(bucket.consume(100.5))
+        self.assertEqual(bucket.take_dropped(), 2)
+        self.assertEqual(bucket.take_dropped(), 0)
+
+    def test_tokens_capped_by_burst(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.consume(0.0)
+        self.assertEqual([bucket.consume(1000.0) for _ in range(3)], [True, True, False])
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0.5)
+
+    def test_filter_limits_only_configured_level(self):
+        limit = RateLimitFilter("test")
+        limit.set_limit(logging.INFO, rate=1, burst=1)
+        info = logging.LogRecord("test", logging.INFO, __file__, 0, "", None, None)
+        error = logging.LogRecord("test", logging.ERROR, __file__, 0, "", None, None)
+
+        self.assertTrue(limit.filter(info))
+        self.assertFalse(limit.filter(info))
+        self.assertTrue(limit.filter(error))
+        self.assertEqual(limit.take_dropped(), [(logging.INFO, 1)])
+
+
+class TestMasterLoggerRateLimit(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = MasterLogger(self.log_file, name="test_rate_limit", report_interval=0)
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        self.logger.flush()
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_limit_shared_with_child_loggers(self):
+        self.logger.set_rate_limit("INFO", rate=0.001, burst=3, names=["test_rate_limit.utils"])
+        utils = self.logger.get_logger("test_rate_limit.utils")
+        child = self.logger.get_logger("test_rate_limit.utils.db")
+        other = self.logger.get_logger("test_rate_limit.api")
+        for i in range(10):
+            utils.info(f"утилиты {i}")
+            child.info(f"база {i}")
+            other.info(f"внешний вызов {i}")
+        utils.error("ошибка утилит")
+        self.logger.report()
+
+        contents = self.read_log()
+        self.assertEqual(contents.count("утилиты") + contents.count("база"), 3)
+        self.assertEqual(contents.count("внешний вызов"), 10)
+        self.assertIn("ошибка утилит", contents)
+        self.assertIn("test_rate_limit.utils INFO: 17 записей отброшено ограничением частоты", contents)
+
+    def test_summary_not_limited(self):
+        self.logger.set_rate_limit("INFO", rate=0.001, burst=2)
+        for i in range(10):
+            self.logger.info(f"запрос {i}")
+        self.logger.report()
+        self.logger.report()
+
+        contents = self.read_log()
+        self.assertEqual(contents.count("запрос"), 2)
+        self.assertIn("test_rate_limit INFO: 8 записей отброшено ограничением частоты", contents)
+        self.assertEqual(contents.count("отброшено"), 1)
+
+    def test_remove_limit_and_close(self):
+        self.logger.set_rate_limit("INFO", rate=0.001, burst=1)
+        self.logger.info("первая")
+        self.logger.info("вторая")
+        self.logger.set_rate_limit("INFO", rate=None)
+        self.logger.info("третья")
+
+        contents = self.read_log()
+        self.assertIn("первая", contents)
+        self.assertNotIn("вторая", contents)
+        self.assertIn("третья", contents)
+
+        self.logger.close()
+        self.assertEqual(logging.getLogger("test_rate_limit").filters, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
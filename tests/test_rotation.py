@@ -0,0 +1,123 @@
+import unittest
+import gzip
+import os
+import time
+import unittest.mock
+from profi_log import MasterLogger
+from profi_log.rotation import CompressedRotatingFileHandler, HybridRotatingFileHandler
+from helpers import LogFileTestCase, make_record
+
+
+class TestCompressedRotatingFileHandler(LogFileTestCase):
+
+    def read_backup(self, index):
+        with gzip.open(f"{self.log_file}.{index}.gz", "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def test_rotates_and_compresses(self):
+        handler = CompressedRotatingFileHandler(self.log_file, maxBytes=20, backupCount=2, encoding="utf-8")
+        for i in range(4):
+            handler.handle(make_record(f"{i}" * 15))
+        handler.close()
+
+        self.assertEqual(self.read_backup(1), "2" * 15 + "\n")
+        self.assertEqual(self.read_backup(2), "1" * 15 + "\n")
+        self.assertFalse(os.path.exists(self.log_file + ".3.gz"))
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["test.log", "test.log.1.gz", "test.log.2.gz"])
+
+    def test_total_bytes_budget(self):
+        handler = CompressedRotatingFileHandler(self.log_file, maxBytes=20, encoding="utf-8")
+        handler.handle(make_record("a" * 15))
+        handler.handle(make_record("b" * 15))
+        handler.wait_compressed()
+        budget = os.path.getsize(self.log_file + ".1.gz") + 10
+        handler.max_total_bytes = budget
+
+        handler.handle(make_record("c" * 15))
+        handler.close()
+
+        self.assertEqual(self.read_backup(1), "b" * 15 + "\n")
+        self.assertFalse(os.path.exists(self.log_file + ".2.gz"))
+
+    def test_compresses_leftover_pending_files(self):
+        with open(self.log_file + ".rotated-3", "w", encoding="utf-8") as f:
+            f.write("осталось после сбоя\n")
+        handler = CompressedRotatingFileHandler(self.log_file, maxBytes=1000)
+        handler.wait_compressed()
+
+        self.assertEqual(self.read_backup(1), "осталось после сбоя\n")
+        self.assertFalse(os.path.exists(self.log_file + ".rotated-3"))
+        handler.close()
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            CompressedRotatingFileHandler(self.log_file, compression="lzma")
+
+    def test_master_logger_compressed_sink(self):
+        logger = MasterLogger(self.log_file, name="test_compressed", max_bytes=200, backup_count=3,
+                              file_sink="compressed")
+        for i in range(20):
+            logger.info(f"Сообщение {i}")
+        logger.close()
+
+        self.assertTrue(os.path.exists(self.log_file + ".1.gz"))
+        self.assertIn("Сообщение", self.read_backup(1))
+
+
+class TestHybridRotatingFileHandler(LogFileTestCase):
+
+    def test_rotates_at_period_boundary(self):
+        handler = HybridRotatingFileHandler(self.log_file, when="hourly", utc=True)
+        # 2024-05-01 13:59:59 и 14:00:00 UTC
+        handler._start_period(1714571999)
+        handler.handle(make_record("до границы", created=1714571999.5))
+        handler.handle(make_record("после границы", created=1714572000.0))
+        handler.close()
+
+        self.assertEqual(self.read_log("test.log.2024-05-01_13"), "до границы\n")
+        self.assertEqual(self.read_log("test.log"), "после границы\n")
+        self.assertEqual(handler.rolloverAt, 1714575600)
+
+    def test_short_writes_are_completed(self):
+        handler = HybridRotatingFileHandler(self.log_file, when="daily")
+        stream = handler.stream
+        # Файл, который за один вызов write записывает не больше 4 байт
+        handler.stream = unittest.mock.Mock(wraps=stream, write=lambda data: stream.write(data[:4]))
+        handler.handle(make_record("длинная запись"))
+        handler.close()
+
+        self.assertEqual(self.read_log("test.log"), "длинная запись\n")
+
+    def test_size_within_period_and_retention(self):
+        now = time.time()
+        handler = HybridRotatingFileHandler(self.log_file, maxBytes=20, backupCount=2, when="daily", utc=True)
+        for i in range(4):
+            handler.handle(make_record(f"{i}" * 15, created=now))
+        handler.close()
+
+        stamp = time.strftime("%Y-%m-%d", time.gmtime(now))
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ["test.log", f"test.log.{stamp}.1", f"test.log.{stamp}.2"])
+        self.assertEqual(self.read_log(f"test.log.{stamp}.2"), "2" * 15 + "\n")
+        self.assertEqual(self.read_log("test.log"), "3" * 15 + "\n")
+
+    def test_does_not_stat_file_per_record(self):
+        handler = HybridRotatingFileHandler(self.log_file, maxBytes=1000)
+        handler.handle(make_record("первая"))
+        with unittest.mock.patch("os.stat") as stat, unittest.mock.patch("os.fstat") as fstat:
+            handler.handle(make_record("вторая"))
+        stat.assert_not_called()
+        fstat.assert_not_called()
+        handler.close()
+
+    def test_master_logger_time_rotation(self):
+        logger = MasterLogger(self.log_file, name="test_time_rotation", rotation="both",
+                              rotation_interval="hourly")
+        self.assertIsInstance(logger._handlers[0], HybridRotatingFileHandler)
+        logger.close()
+        with self.assertRaises(ValueError):
+            MasterLogger(self.log_file, name="test_time_rotation_mmap", rotation="time", file_sink="mmap")
+
+
+if __name__ == '__main__':
+    unittest.main()
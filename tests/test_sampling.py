@@ -0,0 +1,67 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from profi_log import MasterLogger
+from profi_log.sampling import CallSampler
+
+
+class TestCallSampler(unittest.TestCase):
+
+    def test_every(self):
+        sampler = CallSampler("func", every=4)
+        logged = [sampler.should_log() for _ in range(8)]
+        self.assertEqual(logged.count(True), 2)
+        self.assertEqual(sampler.take_suppressed(), 6)
+        self.assertEqual(sampler.take_suppressed(), 0)
+
+    def test_rate(self):
+        sampler = CallSampler("func", rate=0.0)
+        self.assertFalse(any(sampler.should_log() for _ in range(10)))
+        self.assertEqual(sampler.suppressed, 10)
+
+    @patch("profi_log.sampling.time.monotonic", return_value=100.0)
+    def test_max_per_second(self, mock_monotonic):
+        sampler = CallSampler("func", max_per_second=3)
+        self.assertEqual([sampler.should_log() for _ in range(5)], [True, True, True, False, False])
+
+        mock_monotonic.return_value = 101.0
+        self.assertTrue(sampler.should_log())
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            CallSampler("func", every=0)
+        with self.assertRaises(ValueError):
+            CallSampler("func", rate=1.5)
+
+
+class TestSampledFunctionCall(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = MasterLogger(self.log_file, name="test_sampling", report_interval=0)
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_sample_every_with_summary(self):
+        @self.logger.log_function_call(sample_every=3)
+        def hot_function(x):
+            return x * 2
+
+        results = [hot_function(i) for i in range(3000)]
+        self.logger.report()
+
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            log_contents = f.read()
+
+        self.assertEqual(results[10], 20)
+        self.assertEqual(log_contents.count("Вызов функции hot_function"), 1000)
+        self.assertIn("hot_function: 2,000 вызовов пропущено при сэмплировании", log_contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
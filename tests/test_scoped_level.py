@@ -0,0 +1,213 @@
+import unittest
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from profi_log import MasterLogger
+
+
+class TestScopedTemporaryLogLevel(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+        self.logger = MasterLogger(self.log_file, name="test_scoped", level="INFO", report_interval=0)
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        self.logger.flush()
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_other_threads_keep_level(self):
+        entered = threading.Event()
+        logged = threading.Event()
+
+        def other():
+            entered.wait()
+            self.logger.debug("other thread debug")
+            logged.set()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        with self.logger.temporary_log_level("DEBUG"):
+            entered.set()
+            logged.wait()
+            self.logger.debug("scoped debug")
+        thread.join()
+        self.logger.debug("after scope")
+
+        log_contents = self.read_log()
+        self.assertIn("scoped debug", log_contents)
+        self.assertNotIn("other thread debug", log_contents)
+        self.assertNotIn("after scope", log_contents)
+
+    def test_other_tasks_keep_level(self):
+        async def request(name, debug):
+            if debug:
+                with self.logger.temporary_log_level("DEBUG"):
+                    await asyncio.sleep(0)
+                    self.logger.debug("%s debug", name)
+            else:
+                await asyncio.sleep(0)
+                self.logger.debug("%s debug", name)
+
+        async def main():
+            await asyncio.gather(request("a", True), request("b", False))
+
+        asyncio.run(main())
+        log_contents = self.read_log()
+        self.assertIn("a debug", log_contents)
+        self.assertNotIn("b debug", log_contents)
+
+    def test_raised_level_only_in_scope(self):
+        with self.logger.temporary_log_level("ERROR"):
+            self.logger.info("silenced")
+            thread = threading.Thread(target=self.logger.info, args=("other thread info",))
+            thread.start()
+            thread.join()
+        log_contents = self.read_log()
+        self.assertNotIn("silenced", log_contents)
+        self.assertIn("other thread info", log_contents)
+
+    def test_target_child_loggers(self):
+        db = self.logger.get_logger("test_scoped.db")
+        pool = logging.getLogger("test_scoped.db.pool")
+        api = self.logger.get_logger("test_scoped.api")
+        with self.logger.temporary_log_level("DEBUG", names=["test_scoped.db"]):
+            self.assertTrue(db.debug_enabled)
+            db.debug("db debug")
+            pool.debug("pool debug")
+            api.debug("api debug")
+            self.logger.debug("main debug")
+
+        log_contents = self.read_log()
+        self.assertIn("db debug", log_contents)
+        self.assertIn("pool debug", log_contents)
+        self.assertNotIn("api debug", log_contents)
+        self.assertNotIn("main debug", log_contents)
+
+    def test_nested_scopes_restore_level(self):
+        root = logging.getLogger("test_scoped")
+        with self.logger.temporary_log_level("WARNING"):
+            with self.logger.temporary_log_level("DEBUG"):
+                self.assertEqual(root.level, logging.DEBUG)
+                self.logger.debug("inner")
+            self.logger.info("outer info")
+            self.assertTrue(root.filters)
+        self.assertEqual(root.level, logging.INFO)
+        self.assertEqual(root.filters, [])
+        self.assertFalse(self.logger.debug_enabled)
+
+        log_contents = self.read_log()
+        self.assertIn("inner", log_contents)
+        self.assertNotIn("outer info", log_contents)
+
+    def test_overlapping_scopes_in_threads(self):
+        child = logging.getLogger("test_scoped.child")
+        entered = threading.Event()
+        child_entered = threading.Event()
+        exited = threading.Event()
+        logged = threading.Event()
+        checked = threading.Event()
+
+        def outer():
+            with self.logger.temporary_log_level("DEBUG"):
+                entered.set()
+                child_entered.wait()
+            exited.set()
+
+        def inner():
+            entered.wait()
+            with self.logger.temporary_log_level("DEBUG", names=["test_scoped.child"]):
+                child_entered.set()
+                exited.wait()
+                child.debug("scoped child debug")
+                logged.set()
+                checked.wait()
+
+        threads = [threading.Thread(target=outer), threading.Thread(target=inner)]
+        for thread in threads:
+            thread.start()
+        logged.wait()
+        # Основной логгер вернулся к INFO, а временный уровень дочернего действует только в своем потоке
+        self.assertEqual(logging.getLogger("test_scoped").level, logging.INFO)
+        child.debug("leaked child debug")
+        checked.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(child.level, logging.NOTSET)
+        self.assertEqual(child.filters, [])
+
+        log_contents = self.read_log()
+        self.assertIn("scoped child debug", log_contents)
+        self.assertNotIn("leaked child debug", log_contents)
+
+
+class TestScopedLevelWithCoroutines(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_lines(self, logger):
+        logger.close()
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_coroutine_records_use_caller_scope(self):
+        logger = MasterLogger(self.log_file, name="test_scoped_coroutine", level="WARNING", report_interval=0)
+
+        @logger.log_function_call(log_args=False)
+        async def fetch():
+            await asyncio.sleep(0)
+
+        async def main():
+            with logger.temporary_log_level("INFO"):
+                await fetch()
+            await fetch()
+
+        asyncio.run(main())
+        lines = self.read_lines(logger)
+        self.assertEqual(len(lines), 2)
+        self.assertIn("Вызов функции fetch", lines[0])
+        self.assertIn("Функция fetch завершила выполнение", lines[1])
+
+    def test_coroutine_records_use_task_debug_context(self):
+        logger = MasterLogger(self.log_file, name="test_scoped_debug_context", level="WARNING", debug_context=10,
+                              report_interval=0)
+
+        @logger.log_function_call(log_args=False)
+        async def fetch(name):
+            await asyncio.sleep(0)
+
+        async def request(name, fail):
+            await fetch(name)
+            with logger.temporary_log_level("INFO"):
+                await fetch(name)
+            if fail:
+                # Записи из временных областей выводятся в фоновом потоке: дожидаемся их, чтобы порядок был известен
+                logger.flush()
+                logger.error("%s error", name)
+
+        async def main():
+            await asyncio.gather(request("a", False), request("b", True))
+
+        asyncio.run(main())
+        lines = self.read_lines(logger)
+        # Две пары записей fetch из временных областей, затем буфер задачи b и ее ошибка
+        self.assertEqual(len(lines), 7)
+        self.assertIn("b error", lines[6])
+        self.assertTrue(all("fetch" in line for line in lines[4:6]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from profi_log import MasterLogger
+from profi_log.tracebacks import ExceptionAggregator, TracebackRenderer, exception_fingerprint
+
+
+def fail(value):
+    raise ValueError(f"неверное значение {value}")
+
+
+def wrap(value):
+    try:
+        fail(value)
+    except ValueError as e:
+        raise RuntimeError("обертка") from e
+
+
+def recurse(depth):
+    if depth == 0:
+        json.loads("{")
+    recurse(depth - 1)
+
+
+def capture(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        return sys.exc_info()
+
+
+class TestTracebackRenderer(unittest.TestCase):
+
+    def test_matches_format_exception(self):
+        renderer = TracebackRenderer()
+        for exc_info in (capture(fail, 1), capture(wrap, 2), capture(recurse, 30)):
+            self.assertEqual(renderer.render(*exc_info), ''.join(traceback.format_exception(*exc_info)))
+
+    def test_cache_reuses_stack_and_renders_message(self):
+        renderer = TracebackRenderer()
+        first = renderer.render(*capture(fail, 1))
+        second = renderer.render(*capture(fail, 2))
+
+        self.assertEqual((renderer.hits, renderer.misses), (1, 1))
+        self.assertIn("неверное значение 1", first)
+        self.assertIn("неверное значение 2", second)
+
+    def test_cache_is_bounded(self):
+        renderer = TracebackRenderer(max_entries=1)
+        renderer.render(*capture(fail, 1))
+        renderer.render(*capture(recurse, 1))
+        renderer.render(*capture(fail, 1))
+        self.assertEqual((renderer.hits, renderer.misses), (0, 3))
+
+    def test_max_frames(self):
+        text = TracebackRenderer(max_frames=2).render(*capture(recurse, 10))
+        self.assertIn("[... пропущено кадров: ", text)
+        self.assertEqual(text.count('  File "'), 2)
+        self.assertTrue(text.rstrip().endswith("(char 1)"))
+
+    def test_strip_library_frames(self):
+        text = TracebackRenderer(strip_library_frames=True).render(*capture(recurse, 2))
+        self.assertNotIn("decoder.py", text)
+        self.assertIn("[... пропущено кадров библиотек: ", text)
+        self.assertIn("recurse", text)
+
+
+class TestExceptionAggregator(unittest.TestCase):
+
+    def test_fingerprint_depends_on_stack(self):
+        first = exception_fingerprint(*capture(fail, 1)[::2])
+        second = exception_fingerprint(*capture(fail, 2)[::2])
+        other = exception_fingerprint(*capture(wrap, 1)[::2])
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], other[0])
+        self.assertTrue(first[1].startswith("ValueError (test_tracebacks.py:"))
+
+    def test_window_and_top(self):
+        aggregator = ExceptionAggregator(window=60)
+        self.assertEqual([aggregator.hit("a", "A") for _ in range(3)], [1, 2, 3])
+        self.assertEqual(aggregator.hit("b", "B"), 1)
+
+        self.assertEqual(aggregator.take_top(1), [("a", "A", 3)])
+        self.assertEqual(aggregator.take_top(1), [])
+        self.assertEqual(aggregator.hit("a", "A"), 4)
+
+    def test_window_expires(self):
+        aggregator = ExceptionAggregator(window=0.01)
+        aggregator.hit("a", "A")
+        time.sleep(0.02)
+        self.assertEqual(aggregator.hit("a", "A"), 1)
+
+
+class TestLogExceptionTracebackCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_log_exception_uses_cache(self):
+        logger = MasterLogger(self.log_file, name="test_traceback_cache", traceback_max_frames=1)
+        for i in range(3):
+            try:
+                fail(i)
+            except ValueError:
+                logger.log_exception("Ошибка обработки")
+        logger.close()
+
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            contents = f.read()
+        self.assertEqual(contents.count("Ошибка обработки"), 3)
+        self.assertIn("неверное значение 2", contents)
+        self.assertEqual((logger._traceback_renderer.hits, logger._traceback_renderer.misses), (2, 1))
+
+    def test_aggregation(self):
+        logger = MasterLogger(self.log_file, name="test_exception_aggregation", exception_window=60,
+                              report_interval=0)
+        for i in range(3):
+            try:
+                fail(i)
+            except ValueError:
+                logger.log_exception("Ошибка обработки")
+        logger.close()
+
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            contents = f.read()
+        match = re.search(r"Ошибка обработки \[исключение ([0-9a-f]{12})\]\nTraceback", contents)
+        self.assertIsNotNone(match)
+        fingerprint = match.group(1)
+        self.assertEqual(contents.count("Traceback"), 1)
+        self.assertIn(f"[исключение {fingerprint}, повтор 3: ValueError: неверное значение 2]", contents)
+        self.assertIn(f"3 × {fingerprint} ValueError (test_tracebacks.py:", contents)
+
+
+if __name__ == '__main__':
+    unittest.main()